@@ -1,3 +1,3 @@
-from yara_gen.adapters.factory import ADAPTER_MAP, get_adapter
+from yara_gen.adapters.factory import ADAPTER_MAP, ADAPTERS_HELP_STR, get_adapter
 
-__all__ = ["ADAPTER_MAP", "get_adapter"]
+__all__ = ["ADAPTER_MAP", "ADAPTERS_HELP_STR", "get_adapter"]
@@ -1,3 +1,6 @@
+from collections.abc import Mapping
+from types import MappingProxyType
+
 from yara_gen.adapters.csv import GenericCSVAdapter
 from yara_gen.adapters.huggingface import HuggingFaceAdapter
 from yara_gen.models.text import DatasetType
@@ -5,12 +8,17 @@ from yara_gen.models.text import DatasetType
 from .base import BaseAdapter
 from .jsonl import JSONLAdapter
 
-ADAPTER_MAP: dict[str, type[BaseAdapter]] = {
-    "jsonl": JSONLAdapter,
-    "raw-text": JSONLAdapter,  # Fallback/Alias
-    "generic-csv": GenericCSVAdapter,
-    "huggingface": HuggingFaceAdapter,
-}
+ADAPTER_MAP: Mapping[str, type[BaseAdapter]] = MappingProxyType(
+    {
+        "jsonl": JSONLAdapter,
+        "raw-text": JSONLAdapter,  # Fallback/Alias
+        "generic-csv": GenericCSVAdapter,
+        "huggingface": HuggingFaceAdapter,
+    }
+)
+
+# Sorted adapter names as shown in CLI help and error messages
+ADAPTERS_HELP_STR = ", ".join(sorted(ADAPTER_MAP))
 
 
 def get_adapter(name: str, dataset_type: DatasetType) -> BaseAdapter:
@@ -28,8 +36,7 @@ def get_adapter(name: str, dataset_type: DatasetType) -> BaseAdapter:
         ValueError: If the adapter name is unknown.
     """
     if name not in ADAPTER_MAP:
-        valid = ", ".join(ADAPTER_MAP.keys())
-        raise ValueError(f"Unknown adapter '{name}'. Available: {valid}")
+        raise ValueError(f"Unknown adapter '{name}'. Available: {ADAPTERS_HELP_STR}")
 
     adapter_class = ADAPTER_MAP[name]
     return adapter_class(dataset_type=dataset_type)
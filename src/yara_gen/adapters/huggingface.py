@@ -1,16 +1,36 @@
-from collections.abc import Generator
-from pathlib import Path
-from typing import Any
+from __future__ import annotations
 
-from datasets import load_dataset
+import os
+from collections.abc import Generator, Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 from yara_gen.adapters.base import BaseAdapter
+from yara_gen.adapters.utils import prefetch, prefetch_parallel
 from yara_gen.errors import DataError
 from yara_gen.models.text import TextSample
 from yara_gen.utils.logger import get_logger
 
+if TYPE_CHECKING:
+    from datasets import IterableDataset
+
+# huggingface_hub reads its transfer settings once at import time, so this has to
+# happen before `datasets` is imported. High-performance mode lets the Rust-based
+# Xet client download shards over many parallel connections. Users can still opt
+# out by exporting HF_XET_HIGH_PERFORMANCE=0.
+os.environ.setdefault("HF_XET_HIGH_PERFORMANCE", "1")
+
 logger = get_logger()
 
+# Number of rows pulled from the Arrow stream per iteration step
+STREAM_BATCH_SIZE = 1000
+
+# Number of streamed samples between two progress messages
+STREAM_LOG_INTERVAL = 1000
+
+# Number of batches fetched ahead of the consumer by default
+DEFAULT_PREFETCH_BATCHES = 2
+
 
 class HuggingFaceAdapter(BaseAdapter):
     """
@@ -43,6 +63,11 @@ class HuggingFaceAdapter(BaseAdapter):
                 column (str): The name of the text column (default: 'text').
                 split (str): The dataset split to use (default: 'train').
                 config_name (str): The HF configuration/subset name.
+                prefetch (int): Number of batches streamed ahead on a background
+                    thread (default: 2). Set to 0 to stream inline.
+                num_workers (int): Number of dataset shards streamed in parallel
+                    (default: 1). Values above 1 trade the deterministic row order
+                    for throughput on multi-shard datasets.
                 Any other kwargs are passed directly to load_dataset().
 
         Yields:
@@ -51,12 +76,18 @@ class HuggingFaceAdapter(BaseAdapter):
         Raises:
             DataError: If the dataset cannot be found, accessed, or streamed.
         """
+        # Deferred so that CLI start-up and non-Hub runs do not pay the
+        # (multi-hundred millisecond) import cost of `datasets`.
+        from datasets import load_dataset
+
         repo_id = str(source)
 
         # Pop specific args that we handle manually or want to rename
         target_column = kwargs.pop("column", "text")
         config_name = kwargs.pop("config_name", None)
         split = kwargs.pop("split", "train")
+        prefetch_batches = int(kwargs.pop("prefetch", DEFAULT_PREFETCH_BATCHES))
+        num_workers = int(kwargs.pop("num_workers", 1))
 
         log_msg = f"Streaming {repo_id}"
         if config_name:
@@ -78,38 +109,123 @@ class HuggingFaceAdapter(BaseAdapter):
             ) from e
 
         count = 0
+        next_log_at = STREAM_LOG_INTERVAL
+        text_key: str | None = None
+        meta_keys: list[str] | None = None
+        fallback_keys: list[str] = []
         try:
-            for row in ds:
-                # Try to get text from the user-specified column
-                text_content = row.get(target_column)
-                used_key = target_column
-
-                # Heuristic: If default 'text' fails, try 'prompt' as a fallback
-                if not text_content and target_column == "text":
-                    if row.get("prompt"):
-                        text_content = row.get("prompt")
-                        used_key = "prompt"
-                    elif row.get("Prompt"):
-                        text_content = row.get("Prompt")
-                        used_key = "Prompt"
-
-                if not text_content:
-                    continue
-
-                # Metadata is everything except the text column
-                metadata = {k: v for k, v in row.items() if k != used_key}
-
-                yield TextSample(
-                    text=str(text_content),
-                    source=repo_id,
-                    dataset_type=self.dataset_type,
-                    metadata=metadata,
-                )
-                count += 1
-
-                if count % 1000 == 0:
-                    logger.debug(f"Streamed {count} samples from Hub ...")
+            # Iterate in Arrow batches (dict of column lists) instead of row dicts,
+            # so per-column work happens once per batch rather than once per row.
+            # The next batches are downloaded while the current one is consumed.
+            batches = self._iter_batches(ds, num_workers, prefetch_batches)
+            for batch in batches:
+                # The schema is fixed for the whole stream, so the text column
+                # and the metadata columns are resolved once, on the first batch.
+                if text_key is None or meta_keys is None:
+                    # Try to get text from the user-specified column
+                    text_key = target_column
+
+                    # Heuristic: If default 'text' is empty, try 'prompt'. This is
+                    # decided per row (below), so only the candidates are fixed here.
+                    if target_column == "text":
+                        fallback_keys = [k for k in ("prompt", "Prompt") if k in batch]
+
+                    # Metadata is everything except the text column
+                    meta_keys = [k for k in batch if k != text_key]
+
+                texts = batch.get(text_key)
+                if texts is None:
+                    if not fallback_keys:
+                        continue
+                    # No 'text' column at all: every row uses the fallback
+                    texts = [None] * len(batch[fallback_keys[0]])
+
+                meta_columns = [batch[k] for k in meta_keys]
+
+                empty = 0
+                for row, (text_content, *meta_values) in enumerate(
+                    zip(texts, *meta_columns, strict=True)
+                ):
+                    if not text_content and fallback_keys:
+                        used_key = next(
+                            (k for k in fallback_keys if batch[k][row]), None
+                        )
+                        if used_key is not None:
+                            # Metadata is everything except the column used
+                            yield TextSample.model_construct(
+                                text=str(batch[used_key][row]),
+                                source=repo_id,
+                                dataset_type=self.dataset_type,
+                                metadata={
+                                    k: column[row]
+                                    for k, column in batch.items()
+                                    if k != used_key
+                                },
+                            )
+                            continue
+
+                    if not text_content:
+                        empty += 1
+                        continue
+
+                    # All fields are already normalized here, so pydantic
+                    # validation is skipped on this per-row hot path.
+                    yield TextSample.model_construct(
+                        text=str(text_content),
+                        source=repo_id,
+                        dataset_type=self.dataset_type,
+                        metadata=dict(zip(meta_keys, meta_values, strict=True)),
+                    )
+
+                # Progress is tracked per batch rather than per row
+                count += len(texts) - empty
+                if count >= next_log_at:
+                    logger.debug("Streamed %d samples from Hub ...", count)
+                    next_log_at = (
+                        count // STREAM_LOG_INTERVAL + 1
+                    ) * STREAM_LOG_INTERVAL
         except Exception as e:
             # Catch errors that occur mid-stream (e.g. network drop)
             raise DataError(f"Stream interrupted for '{repo_id}': {str(e)}") from e
-        logger.info(f"Finished streaming {count} samples from {repo_id}.")
+        logger.info("Finished streaming %d samples from %s.", count, repo_id)
+
+    def _iter_batches(
+        self, ds: IterableDataset, num_workers: int, prefetch_batches: int
+    ) -> Iterator[dict[str, list[Any]]]:
+        """
+        Streams Arrow batches, optionally reading several shards in parallel.
+
+        Each worker streams a disjoint subset of the shards over its own
+        connection. The worker count is reduced to a divisor of the shard count,
+        because `split_dataset_by_node` otherwise makes every worker read all
+        shards and skip rows.
+
+        Args:
+            ds: The streaming dataset.
+            num_workers: Requested number of parallel shard readers.
+            prefetch_batches: Number of batches buffered ahead per worker.
+
+        Returns:
+            Iterator[dict[str, list[Any]]]: Batches as dicts of column lists.
+        """
+        n_shards = ds.n_shards
+        world_size = max(
+            (n for n in range(1, min(num_workers, n_shards) + 1) if n_shards % n == 0),
+            default=1,
+        )
+
+        if world_size == 1:
+            return prefetch(ds.iter(batch_size=STREAM_BATCH_SIZE), prefetch_batches)
+
+        from datasets.distributed import split_dataset_by_node
+
+        logger.info("Streaming %d shards with %d workers ...", n_shards, world_size)
+        shard_streams = [
+            split_dataset_by_node(ds, rank=rank, world_size=world_size).iter(
+                batch_size=STREAM_BATCH_SIZE
+            )
+            for rank in range(world_size)
+        ]
+        return prefetch_parallel(
+            shard_streams, buffer_size=max(prefetch_batches, 1) * world_size
+        )
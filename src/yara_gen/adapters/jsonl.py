@@ -1,10 +1,10 @@
-import json
 from collections.abc import Generator
 from pathlib import Path
 from typing import Any
 
 from yara_gen.adapters.base import BaseAdapter
 from yara_gen.models.text import TextSample
+from yara_gen.utils.json_fast import JSONDecodeError, loads
 from yara_gen.utils.logger import get_logger
 
 logger = get_logger()
@@ -47,19 +47,21 @@ class JSONLAdapter(BaseAdapter):
             FileNotFoundError: If the source file does not exist.
         """
         self.validate_file(source)
-        logger.debug(f"Streaming data from {source}")
+        logger.debug("Streaming data from %s", source)
 
         success_count = 0
         error_count = 0
 
-        with source.open("r", encoding="utf-8") as f:
+        # Lines are parsed straight from bytes, which skips the separate UTF-8
+        # decode into str that a text-mode file would do
+        with source.open("rb") as f:
             for line_no, line in enumerate(f, 1):
                 line = line.strip()
                 if not line:
                     continue
 
                 try:
-                    data = json.loads(line)
+                    data = loads(line)
 
                     # Extract Text (Try multiple common keys)
                     text_content = (
@@ -86,14 +88,16 @@ class JSONLAdapter(BaseAdapter):
                     yield sample
                     success_count += 1
 
-                except json.JSONDecodeError:
+                except JSONDecodeError:
                     error_count += 1
-                    logger.debug(f"JSON decode error at line {line_no} in {source}")
+                    logger.debug("JSON decode error at line %d in %s", line_no, source)
                 except Exception as e:
                     error_count += 1
-                    logger.warning(f"Unexpected error at line {line_no}: {e}")
+                    logger.warning("Unexpected error at line %d: %s", line_no, e)
 
         logger.info(
-            f"Loaded {success_count} samples from {source.name} "
-            f"(Skipped {error_count} errors)"
+            "Loaded %d samples from %s (Skipped %d errors)",
+            success_count,
+            source.name,
+            error_count,
         )
@@ -1,10 +1,31 @@
-from collections.abc import Generator, Iterable
+import queue
+import threading
+from collections.abc import Callable, Generator, Iterable, Sequence
+from operator import attrgetter
+from typing import Any
 
 from yara_gen.models.text import TextSample
 from yara_gen.utils.logger import get_logger
 
 logger = get_logger()
 
+# Marks the end of a prefetched stream
+_EXHAUSTED = object()
+
+# How long a prefetch worker waits on a full buffer before re-checking for shutdown
+_PUT_TIMEOUT_SECONDS = 0.1
+
+
+class _ProducerError:
+    """Carries an exception from a prefetch worker to the consuming thread."""
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+def _dataset_type_value(sample: TextSample) -> str:
+    return sample.dataset_type.value
+
 
 def filter_stream(
     stream: Iterable[TextSample], filter_col: str, filter_val: str
@@ -28,25 +49,31 @@ def filter_stream(
         f"Filtering stream: keeping rows where '{filter_col}' == '{filter_val}'"
     )
 
+    # The predicate is resolved once, not per sample: the comparison target and,
+    # if the user filters by 'source' or 'dataset_type', the core-attribute
+    # fallback for samples without that metadata key.
+    target = str(filter_val)
+    fallback: Callable[[TextSample], Any] | None = None
+    if filter_col == "source":
+        fallback = attrgetter("source")
+    elif filter_col == "dataset_type":
+        fallback = _dataset_type_value
+
     for sample in stream:
         total += 1
 
         # Check metadata first (most common), then fall back to core attributes
         val_in_sample = sample.metadata.get(filter_col)
-
-        # If not in metadata, check if user is filtering by 'source' or 'dataset_type'
-        if val_in_sample is None:
-            if filter_col == "source":
-                val_in_sample = sample.source
-            elif filter_col == "dataset_type":
-                val_in_sample = sample.dataset_type.value
+        if val_in_sample is None and fallback is not None:
+            val_in_sample = fallback(sample)
 
         if val_in_sample is None:
             missing_col_count += 1
             continue
 
-        # String comparison for robustness (e.g. 1 vs "1")
-        if str(val_in_sample) == str(filter_val):
+        # String comparison for robustness (e.g. 1 vs "1"); str() is only needed
+        # for non-string values
+        if val_in_sample == target or str(val_in_sample) == target:
             yield sample
             kept += 1
 
@@ -62,3 +89,101 @@ def filter_stream(
         logger.warning(
             f"Filter matched 0 samples! (Verified column '{filter_col}' exists)."
         )
+
+
+def prefetch[T](iterable: Iterable[T], buffer_size: int = 2) -> Generator[T]:
+    """
+    Middleware that pulls items from a source iterable on a background thread.
+
+    Up to `buffer_size` items are produced ahead of the consumer, so slow item
+    production (e.g. network reads while streaming from the Hub) overlaps with the
+    processing of the previous item instead of alternating with it.
+
+    Args:
+        iterable: The source iterable. It is consumed exclusively by the worker.
+        buffer_size: Maximum number of items produced ahead of the consumer.
+            Values below 1 disable prefetching and iterate inline.
+
+    Yields:
+        T: The items of the source iterable, in their original order.
+
+    Raises:
+        Exception: Any exception raised by the source iterable is re-raised in the
+            consuming thread.
+    """
+    if buffer_size < 1:
+        yield from iterable
+        return
+
+    yield from prefetch_parallel([iterable], buffer_size)
+
+
+def prefetch_parallel[T](
+    iterables: Sequence[Iterable[T]], buffer_size: int = 2
+) -> Generator[T]:
+    """
+    Drains several source iterables concurrently, one worker thread per source.
+
+    Items are yielded in arrival order, so items of different sources interleave
+    non-deterministically while the order within each source is preserved. Workers
+    are daemon threads: a consumer that stops early (or is interrupted with Ctrl-C)
+    never waits for a worker stuck in a network read.
+
+    Args:
+        iterables: The source iterables, each consumed by its own worker.
+        buffer_size: Maximum number of items buffered ahead of the consumer,
+            shared across all workers.
+
+    Yields:
+        T: The items of all source iterables.
+
+    Raises:
+        Exception: The first exception raised by any source iterable is re-raised
+            in the consuming thread.
+    """
+    buffer: queue.Queue[Any] = queue.Queue(maxsize=max(buffer_size, 1))
+    stop = threading.Event()
+
+    def put(item: Any) -> bool:
+        # Time out periodically so an abandoned consumer does not leave the
+        # worker blocked on a full buffer forever.
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=_PUT_TIMEOUT_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce(iterable: Iterable[T]) -> None:
+        try:
+            for item in iterable:
+                if not put(item):
+                    return
+        except Exception as e:
+            put(_ProducerError(e))
+            return
+        put(_EXHAUSTED)
+
+    workers = [
+        threading.Thread(
+            target=produce, args=(it,), name=f"yara-gen-prefetch-{i}", daemon=True
+        )
+        for i, it in enumerate(iterables)
+    ]
+    for worker in workers:
+        worker.start()
+
+    try:
+        active = len(workers)
+        while active:
+            item = buffer.get()
+            if item is _EXHAUSTED:
+                active -= 1
+                continue
+            if isinstance(item, _ProducerError):
+                raise item.error
+            yield item
+    finally:
+        # Releases the workers if the consumer stops early (e.g. --limit)
+        stop.set()
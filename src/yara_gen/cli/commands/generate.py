@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 import argparse
+import logging
 import sys
-from collections.abc import Iterator
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 from typing import Any
 
-from yara_gen.adapters import ADAPTER_MAP, get_adapter
+from yara_gen.adapters import ADAPTERS_HELP_STR, get_adapter
 from yara_gen.constants import DEFAULT_RULE_FILENAME, EngineType
 from yara_gen.engine.factory import get_engine
 from yara_gen.errors import ConfigurationError, DataError
@@ -28,8 +29,6 @@ def register_args(
     subparsers: argparse._SubParsersAction[argparse.ArgumentParser],
     parents: list[argparse.ArgumentParser],
 ) -> None:
-    available_adapters = ", ".join(sorted(ADAPTER_MAP.keys()))
-
     parser = subparsers.add_parser(
         "generate",
         help="Extract signatures from adversarial inputs and generate YARA rules.",
@@ -55,7 +54,7 @@ def register_args(
         "-a",
         type=str,
         help=(
-            f"Adapter for adversarial input. Options: [{available_adapters}] "
+            f"Adapter for adversarial input. Options: [{ADAPTERS_HELP_STR}] "
             "(overrides config)"
         ),
     )
@@ -72,7 +71,7 @@ def register_args(
         "-ba",
         type=str,
         help=(
-            f"Adapter for benign input. Options: [{available_adapters}] "
+            f"Adapter for benign input. Options: [{ADAPTERS_HELP_STR}] "
             "(overrides config)"
         ),
     )
@@ -120,14 +119,16 @@ def _load_app_configuration(args: argparse.Namespace) -> AppConfig:
     """
     # args.config comes from the parent parser in cli/args.py
     config_path = getattr(args, "config", Path("generation_config.yaml"))
-    logger.info(f"Loading configuration from: {config_path}")
+    logger.info("Loading configuration from: %s", config_path)
 
     # Load raw dict; empty if file missing (handled in load_config defaults/errors)
     raw_config = load_config(config_path)
 
     # Apply Dot-Notation overrides (--set)
     # e.g. --set engine.min_ngram=4
-    raw_config = apply_overrides(raw_config, getattr(args, "set", None))
+    overrides = getattr(args, "set", None)
+    if overrides:
+        raw_config = apply_overrides(raw_config, overrides)
 
     # Apply explicit CLI argument overrides
     if args.output:
@@ -176,7 +177,7 @@ def _initialize_components(app_config: AppConfig) -> tuple[Any, Any, Any]:
     adv_adapter_type = app_config.adversarial_adapter.type
     benign_adapter_type = app_config.benign_adapter.type
 
-    logger.info(f"Starting generation with Engine: {engine_type}")
+    logger.info("Starting generation with Engine: %s", engine_type)
 
     try:
         engine = get_engine(app_config.engine)
@@ -202,7 +203,7 @@ def _load_pipeline_data(
         if not adv_path:
             raise ConfigurationError("No input path provided (via CLI argument).")
 
-        logger.info(f"Loading adversarial data: {adv_path}")
+        logger.info("Loading adversarial data: %s", adv_path)
         adv_stream = adv_adapter.load(
             adv_path, **app_config.adversarial_adapter.model_dump(exclude={"type"})
         )
@@ -213,7 +214,7 @@ def _load_pipeline_data(
                 "No benign dataset path provided (--benign-dataset)."
             )
 
-        logger.info(f"Loading benign data: {benign_path}")
+        logger.info("Loading benign data: %s", benign_path)
         benign_stream = benign_adapter.load(
             benign_path, **app_config.benign_adapter.model_dump(exclude={"type"})
         )
@@ -225,39 +226,60 @@ def _load_pipeline_data(
         sys.exit(1)
 
 
-def _apply_deduplication(
-    rules: list[GeneratedRule], existing_rules_path: Path | None
-) -> list[GeneratedRule]:
+def _post_process_rules(
+    rules: list[GeneratedRule],
+    tags: list[str],
+    metadata: dict[str, str],
+    existing_rules_path: Path | None,
+) -> Iterator[GeneratedRule]:
     """
-    Removes rules that match existing rules.
+    Removes rules that match existing rules and applies global tags and metadata.
+
+    Both steps are fused into a single lazy pass, so the surviving rules flow
+    straight into the writer without an intermediate list.
     """
+    existing_payloads: frozenset[str] = frozenset()
     if existing_rules_path and existing_rules_path.exists():
-        logger.info(f"Deduplicating against existing rules: {existing_rules_path}")
+        logger.info("Deduplicating against existing rules: %s", existing_rules_path)
         existing_payloads = parse_existing_rules(existing_rules_path)
-        initial_count = len(rules)
 
-        # Determine unique payloads to check
-        rules = [
-            r for r in rules if not any(s.value in existing_payloads for s in r.strings)
-        ]
+    annotate = bool(tags or metadata)
+    if annotate and logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Applying global tags/metadata to %d rules. Tags: %s, Metadata Keys: %s",
+            len(rules),
+            tags,
+            list(metadata.keys()),
+        )
 
-        dropped_count = initial_count - len(rules)
-        if dropped_count > 0:
-            logger.info(
-                f"Deduplication complete. Dropped {dropped_count} duplicate rules."
-            )
-    return rules
+    dropped_count = 0
+    for rule in rules:
+        # isdisjoint() walks the strings in C and stops at the first match
+        if existing_payloads and not existing_payloads.isdisjoint(
+            s.value for s in rule.strings
+        ):
+            dropped_count += 1
+            continue
+        if annotate:
+            rule.tags.extend(tags)
+            rule.metadata.update(metadata)
+        yield rule
+
+    if dropped_count > 0:
+        logger.info(
+            "Deduplication complete. Dropped %d duplicate rules.", dropped_count
+        )
 
 
-def _write_results(rules: list[GeneratedRule], output_path: str) -> None:
+def _write_results(rules: Iterable[GeneratedRule], output_path: str) -> None:
     """
     Writes generated rules to a file.
     """
     try:
         writer = YaraWriter()
-        writer.write(rules, Path(output_path))
-        if rules:
-            logger.info(f"Generation complete. Created {len(rules)} rules.")
+        count = writer.write(rules, Path(output_path))
+        if count:
+            logger.info("Generation complete. Created %d rules.", count)
         else:
             logger.warning("Generation complete, but NO rules were created.")
     except OSError as e:
@@ -290,19 +312,10 @@ def run(args: argparse.Namespace) -> None:
         # Execute Extraction
         rules = engine.extract(adversarial=adv_stream, benign=benign_stream)
 
-        # Post-Processing: Apply Tags and Metadata
-        if app_config.tags or app_config.metadata:
-            logger.debug(
-                f"Applying global tags/metadata to {len(rules)} rules. "
-                f"Tags: {app_config.tags}, "
-                f"Metadata Keys: {list(app_config.metadata.keys())}"
-            )
-            for rule in rules:
-                rule.tags.extend(app_config.tags)
-                rule.metadata.update(app_config.metadata)
-
-        # Deduplication
-        rules = _apply_deduplication(rules, args.existing_rules)
+        # Post-Processing: Deduplication, Tags and Metadata
+        rules = _post_process_rules(
+            rules, app_config.tags, app_config.metadata, args.existing_rules
+        )
 
         # Output Generation
         output_file = app_config.output_path or DEFAULT_RULE_FILENAME
@@ -1,14 +1,17 @@
 from __future__ import annotations
 
 import argparse
-import json
+import itertools
+import logging
 import sys
-from collections.abc import Iterator
+from collections.abc import Generator, Iterable, Iterator
 from pathlib import Path
 from typing import Any
 
-from yara_gen.adapters import ADAPTER_MAP, get_adapter
-from yara_gen.adapters.utils import filter_stream
+from pydantic_core import to_json
+
+from yara_gen.adapters import ADAPTERS_HELP_STR, get_adapter
+from yara_gen.adapters.utils import filter_stream, prefetch
 from yara_gen.cli.utils import parse_filter_arg
 from yara_gen.constants import AdapterType
 from yara_gen.errors import ConfigurationError, DataError
@@ -16,6 +19,7 @@ from yara_gen.models.adapter_config import AdapterConfig
 from yara_gen.models.config import PrepareConfig
 from yara_gen.models.text import DatasetType, TextSample
 from yara_gen.utils.config import apply_overrides
+from yara_gen.utils.fastwrite import ChunkWriter
 from yara_gen.utils.logger import (
     get_logger,
     log_config,
@@ -24,13 +28,20 @@ from yara_gen.utils.logger import (
 
 logger = get_logger()
 
+# Pending output that triggers a write; collapses block writes into few syscalls
+OUTPUT_BUFFER_SIZE = 1 << 20  # 1 MiB
+
+# Number of serialized samples joined into a single write() call
+WRITE_BLOCK_SIZE = 4096
+
+# Number of serialized blocks buffered ahead of the writer
+WRITE_PREFETCH_BLOCKS = 4
+
 
 def register_args(
     subparsers: argparse._SubParsersAction[argparse.ArgumentParser],
     parents: list[argparse.ArgumentParser],
 ) -> None:
-    available_adapters = ", ".join(sorted(ADAPTER_MAP.keys()))
-
     parser = subparsers.add_parser(
         "prepare",
         help="Ingest a large dataset and normalize it into optimized JSONL format.",
@@ -56,7 +67,7 @@ def register_args(
         "-a",
         type=str,
         default=None,
-        help=(f"The parsing logic to use. Options: [{available_adapters}]"),
+        help=(f"The parsing logic to use. Options: [{ADAPTERS_HELP_STR}]"),
     )
 
     parser.add_argument(
@@ -106,11 +117,13 @@ def _build_configuration(args: argparse.Namespace) -> PrepareConfig:
     raw_config: dict[str, Any] = {"adapter": {"type": adapter_type}}
 
     # Apply Dot-Notation Overrides (--set adapter.config_name=foo)
-    try:
-        raw_config = apply_overrides(raw_config, getattr(args, "set", None))
-    except ConfigurationError as e:
-        logger.error(f"Configuration Error: {e}")
-        sys.exit(1)
+    overrides = getattr(args, "set", None)
+    if overrides:
+        try:
+            raw_config = apply_overrides(raw_config, overrides)
+        except ConfigurationError as e:
+            logger.error(f"Configuration Error: {e}")
+            sys.exit(1)
 
     try:
         return PrepareConfig(**raw_config)
@@ -142,29 +155,70 @@ def _get_dataset_stream(
         sys.exit(1)
 
 
+def _serialize_blocks(
+    stream: Iterable[TextSample], limit: int | None
+) -> Generator[tuple[bytes, int]]:
+    """
+    Serializes samples to JSONL lines and groups them into write blocks.
+
+    Yields:
+        tuple[bytes, int]: A block of JSONL lines and the number of samples in it.
+    """
+    # The limit is applied by islice, which keeps the check out of the loop
+    if limit:
+        stream = itertools.islice(stream, limit)
+
+    # Progress is reported once per block, and only if it would be emitted
+    debug = logger.isEnabledFor(logging.DEBUG)
+
+    block: list[bytes] = []
+    count = 0
+    try:
+        for sample in stream:
+            # pydantic's Rust serializer encodes sample.to_dict() without building
+            # the intermediate dict. Lines are compact (no spaces after ":" and
+            # ","), and metadata values json.dumps rejects (dates, bytes, ...)
+            # are written the way pydantic serializes them instead of failing.
+            block.append(to_json(sample) + b"\n")
+            count += 1
+
+            if len(block) >= WRITE_BLOCK_SIZE:
+                yield b"".join(block), len(block)
+                block.clear()
+                if debug:
+                    logger.debug("Processed %d samples ...", count)
+    except Exception:
+        # Samples serialized before a stream error are still written
+        if block:
+            yield b"".join(block), len(block)
+        raise
+
+    if block:
+        yield b"".join(block), len(block)
+
+    if limit and count >= limit:
+        logger.info(f"Reached limit of {limit} samples.")
+
+
 def _write_output(
     stream: Iterator[TextSample], output_path: Path, limit: int | None
 ) -> None:
     """
     Writes the stream to the output file.
+
+    Reading and serialization run on a background thread, so they overlap with
+    the disk writes done by the calling thread. Samples are written in order.
     """
     try:
         count = 0
         # Ensure parent dir exists
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with output_path.open("w", encoding="utf-8") as f:
-            for sample in stream:
-                line = json.dumps(sample.to_dict(), ensure_ascii=False)
-                f.write(line + "\n")
-                count += 1
-
-                if count % 1000 == 0:
-                    logger.debug(f"Processed {count} samples ...")
-
-                if limit and count >= limit:
-                    logger.info(f"Reached limit of {limit} samples.")
-                    break
+        blocks = prefetch(_serialize_blocks(stream, limit), WRITE_PREFETCH_BLOCKS)
+        with ChunkWriter(output_path, flush_size=OUTPUT_BUFFER_SIZE) as f:
+            for data, block_count in blocks:
+                f.write(data)
+                count += block_count
 
         logger.info(f"Successfully wrote {count} samples to {output_path}")
 
@@ -1,8 +1,24 @@
+import re
+
+# 'column=value', split at the first '=' with surrounding whitespace stripped
+FILTER_RE = re.compile(r"\s*([^=]*?)\s*=\s*(.*?)\s*", re.DOTALL)
+
+
 def parse_filter_arg(filter_str: str | None) -> tuple[str | None, str | None]:
     """Helper to parse 'col=val' string."""
     if not filter_str:
         return None, None
-    if "=" not in filter_str:
+    match = FILTER_RE.fullmatch(filter_str)
+    if match is None:
         raise ValueError("Filter must be in 'column=value' format (e.g. 'label=1')")
-    key, val = filter_str.split("=", 1)
-    return key.strip(), val.strip()
+    return match.group(1), match.group(2)
+
+
+def parse_filter_args(filter_strs: list[str]) -> dict[str, str]:
+    """Helper to parse several 'col=val' strings into a column -> value map."""
+    filters = {}
+    for filter_str in filter_strs:
+        key, val = parse_filter_arg(filter_str)
+        if key is not None and val is not None:
+            filters[key] = val
+    return filters
@@ -35,6 +35,7 @@ class EngineConstants(Enum):
 
     # Limits
     MAX_RULES_PER_RUN = 50
+    MIN_MARGINAL_GAIN_FRAC = 0.005
 
     # Scoring
     DEFAULT_BENIGN_PENALTY = 1.0
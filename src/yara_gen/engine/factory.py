@@ -1,3 +1,5 @@
+from collections.abc import Mapping
+from types import MappingProxyType
 from typing import Any
 
 from yara_gen.engine.base import BaseEngine
@@ -6,6 +8,15 @@ from yara_gen.engine.stub import StubEngine
 from yara_gen.errors import ConfigurationError
 from yara_gen.models.engine_config import BaseEngineConfig
 
+ENGINE_MAP: Mapping[str, type[BaseEngine[Any]]] = MappingProxyType(
+    {
+        "stub": StubEngine,
+        "ngram": NgramEngine,
+    }
+)
+
+_VALID_ENGINES = ", ".join(ENGINE_MAP)
+
 
 def get_engine(config: BaseEngineConfig) -> BaseEngine[BaseEngineConfig]:
     """
@@ -20,16 +31,10 @@ def get_engine(config: BaseEngineConfig) -> BaseEngine[BaseEngineConfig]:
     Raises:
         ConfigurationError: If the engine type (config.type) is unknown.
     """
-    engine_map: dict[str, type[BaseEngine[Any]]] = {
-        "stub": StubEngine,
-        "ngram": NgramEngine,
-    }
-
-    if config.type not in engine_map:
-        valid_engines = ", ".join(engine_map.keys())
+    engine_class = ENGINE_MAP.get(config.type)
+    if engine_class is None:
         raise ConfigurationError(
-            f"Unknown engine type '{config.type}'. Available: {valid_engines}"
+            f"Unknown engine type '{config.type}'. Available: {_VALID_ENGINES}"
         )
 
-    engine_class = engine_map[config.type]
     return engine_class(config)
@@ -1,9 +1,12 @@
+import heapq
 import itertools
-from collections.abc import Iterable
+import uuid
+from collections import Counter
+from collections.abc import Callable, Iterable
+from functools import partial
 from typing import Any
 
 import numpy as np
-from sklearn.feature_extraction.text import CountVectorizer
 
 from yara_gen.constants import EngineConstants
 from yara_gen.engine.base import BaseEngine
@@ -14,9 +17,98 @@ from yara_gen.models.text import GeneratedRule, TextSample
 from yara_gen.utils.logger import get_logger
 from yara_gen.utils.progress import ProgressGenerator
 
+try:
+    import ahocorasick
+
+    _HAS_AHOCORASICK = True
+except ImportError:  # Optional "fast" extra
+    _HAS_AHOCORASICK = False
+
 logger = get_logger()
 
 PROGRESS_LOG_INTERVAL = 100
+BENIGN_CHUNK_SIZE = 10_000
+HASH_N_FEATURES = 2**20
+
+# Worker-side cache of the last vocabulary unpacked by `_unpack_vocabulary`
+_worker_vocabulary: tuple[str, dict[str, int]] | None = None
+
+
+def _fit_order(vectorizer: Any, n: int, texts: list[str]) -> tuple[np.ndarray, Any]:
+    """
+    Fits a copy of `vectorizer` restricted to n-grams of length `n`.
+
+    Returns:
+        A tuple of (feature names, document-term matrix); both are empty if no
+        n-gram of this length passes `min_df`.
+    """
+    from scipy import sparse
+    from sklearn.base import clone
+
+    order_vectorizer = clone(vectorizer).set_params(ngram_range=(n, n))
+    try:
+        X = order_vectorizer.fit_transform(texts)
+    except ValueError:
+        return np.array([], dtype=object), sparse.csr_matrix((len(texts), 0))
+    return order_vectorizer.get_feature_names_out(), X
+
+
+def _count_chunk_vocabulary(
+    analyzer: Callable[[str], list[str]],
+    vocabulary: dict[str, int],
+    texts: tuple[str, ...],
+) -> tuple[np.ndarray, int]:
+    """
+    Returns per-feature document counts for one chunk of benign texts.
+
+    N-grams are looked up in the fitted vocabulary directly, which skips
+    transform()'s per-call analyzer set-up, vocabulary checks and sparse matrix
+    construction, none of which are needed for column totals. Duplicate texts
+    (common with templated prompts) are analyzed once and counted per occurrence.
+    """
+    get = vocabulary.get
+    hits: list[int] = []
+    # Duplicates are analyzed once; their hits are repeated per occurrence
+    for text, count in Counter(texts).items():
+        doc_hits = [*{i for ngram in analyzer(text) if (i := get(ngram)) is not None}]
+        hits.extend(doc_hits * count)
+    return np.bincount(hits, minlength=len(vocabulary)), len(texts)
+
+
+def _pack_vocabulary(vocabulary: dict[str, int]) -> np.ndarray:
+    """
+    Packs a vocabulary into one newline-separated UTF-8 byte array.
+
+    joblib memory-maps large numpy arguments instead of pickling them, so the
+    packed array reaches the workers as a file reference. (Word n-grams never
+    contain a newline.)
+    """
+    names = sorted(vocabulary, key=vocabulary.__getitem__)
+    return np.frombuffer("\n".join(names).encode("utf-8"), dtype=np.uint8)
+
+
+def _unpack_vocabulary(token: str, packed: np.ndarray) -> dict[str, int]:
+    """
+    Rebuilds a vocabulary packed by `_pack_vocabulary`, once per process.
+
+    Workers are reused across tasks, so the dict is cached under `token` and
+    only rebuilt when a different vocabulary arrives.
+    """
+    global _worker_vocabulary
+    if _worker_vocabulary is None or _worker_vocabulary[0] != token:
+        names = packed.tobytes().decode("utf-8").split("\n")
+        _worker_vocabulary = (token, {name: i for i, name in enumerate(names)})
+    return _worker_vocabulary[1]
+
+
+def _count_chunk_packed(
+    analyzer: Callable[[str], list[str]],
+    token: str,
+    packed: np.ndarray,
+    texts: tuple[str, ...],
+) -> tuple[np.ndarray, int]:
+    """`_count_chunk_vocabulary` for a vocabulary packed by `_pack_vocabulary`."""
+    return _count_chunk_vocabulary(analyzer, _unpack_vocabulary(token, packed), texts)
 
 
 class NgramEngine(BaseEngine[NgramEngineConfig]):
@@ -77,6 +169,9 @@ class NgramEngine(BaseEngine[NgramEngineConfig]):
             ValueError: If the adversarial dataset is empty or if vectorization fails
             due
         """
+        # Deferred so that CLI start-up does not pay the scikit-learn import cost
+        from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer
+
         # Streaming setup
         # We need to peek at the first adversarial item to get the 'source' name,
         # but we cannot consume the iterator.
@@ -97,126 +192,352 @@ class NgramEngine(BaseEngine[NgramEngineConfig]):
             interval=PROGRESS_LOG_INTERVAL,
         )
 
-        # We create a text generator for the vectorizer
-        adv_texts = (s.text for s in adv_stream_tracked)
         benign_texts = (s.text for s in benign)
+        ngram_range = (self.config.min_ngram, self.config.max_ngram)
+
+        # Hashing mode: hash buckets only narrow down where the frequent n-grams
+        # are; they are then resolved to the exact vocabulary CountVectorizer
+        # would have fitted, so scores and coverage never mix colliding n-grams.
+        if self.config.use_hashing:
+            # Kept as a list because the texts are read again to resolve buckets
+            adv_text_list = [s.text for s in adv_stream_tracked]
+            hasher = HashingVectorizer(
+                ngram_range=ngram_range,
+                n_features=HASH_N_FEATURES,
+                alternate_sign=False,
+                norm=None,
+                binary=True,
+                lowercase=True,
+                analyzer="word",
+                dtype=np.int64,
+            )
+            logger.debug("Generating hashed n-gram candidates ...")
+            buckets = self._hash_adversarial(hasher, adv_text_list)
+            feature_names, X_adv = self._resolve_buckets(hasher, adv_text_list, buckets)
+            del adv_text_list, hasher
+
+            # An ordinary fitted vocabulary from here on (used for benign counting)
+            vectorizer: Any = CountVectorizer(
+                ngram_range=ngram_range,
+                binary=True,
+                lowercase=True,
+                analyzer="word",
+                vocabulary={name: i for i, name in enumerate(feature_names.tolist())},
+            )
+            vectorizer.fit([])
+            n_features = len(feature_names)
+        else:
+            # We create a text generator for the vectorizer
+            adv_texts = (s.text for s in adv_stream_tracked)
+
+            # We use a single vectorizer to handle both datasets. This ensures the
+            # vocabulary (feature indices) is identical for efficient numpy
+            # operations.
+            vectorizer = CountVectorizer(
+                ngram_range=ngram_range,
+                min_df=self.config.min_document_frequency,
+                binary=True,  # We care about presence (Document Freq), not Count.
+                lowercase=True,
+                analyzer="word",
+            )
 
-        # We use a single vectorizer to handle both datasets. This ensures the
-        # vocabulary (feature indices) is identical for efficient numpy operations.
-        vectorizer = CountVectorizer(
-            ngram_range=(
-                self.config.min_ngram,
-                self.config.max_ngram,
-            ),
-            min_df=self.config.min_document_frequency,
-            binary=True,  # We care about presence (Document Freq), not Count.
-            lowercase=True,
-            analyzer="word",
-        )
-
-        logger.debug("Generating n-gram candidates ...")
-        try:
+            logger.debug("Generating n-gram candidates ...")
             # Fit on adversarial to find candidates
-            X_adv = vectorizer.fit_transform(adv_texts)
-        except ValueError as e:
-            # Usually happens if vocabulary is empty (e.g. documents too short)
-            raise DataError(
-                "No n-grams met the frequency threshold. "
-                "The adversarial dataset might be too small or too diverse."
-            ) from e
+            if self.config.n_jobs == 1 or ngram_range[0] == ngram_range[1]:
+                try:
+                    X_adv = vectorizer.fit_transform(adv_texts)
+                except ValueError as e:
+                    # Usually happens if vocabulary is empty (e.g. documents too
+                    # short)
+                    raise DataError(
+                        "No n-grams met the frequency threshold. "
+                        "The adversarial dataset might be too small or too diverse."
+                    ) from e
+            else:
+                X_adv = self._fit_per_order(vectorizer, list(adv_texts))
+            feature_names = vectorizer.get_feature_names_out()
+            n_features = len(feature_names)
+
+        # Column-major from here on: scoring sums columns and Set Cover slices
+        # them, and column slicing a CSR matrix walks every stored entry.
+        # (No-op when the matrix already is CSC.)
+        X_adv = X_adv.tocsc()
 
         # Get the actual count from the matrix shape (rows, columns)
         n_adv = X_adv.shape[0]
-        feature_names = vectorizer.get_feature_names_out()
-        logger.info(
-            f"Analyzed {len(feature_names)} candidate n-grams from {n_adv} samples."
-        )
+        logger.info(f"Analyzed {n_features} candidate n-grams from {n_adv} samples.")
 
         # Benign Cross-Reference
-        # Vectorizer is already fitted, so we use transform()
-        try:
-            X_benign = vectorizer.transform(benign_texts)
-            benign_counts = np.array(X_benign.sum(axis=0)).flatten()
-            n_benign = X_benign.shape[0]
-            if n_benign == 0:
-                n_benign = 1  # Avoid division by zero
-        except ValueError:
-            # Likely empty benign set or issues with stream
-            logger.debug("Benign set empty or invalid, assuming 0 benign occurrences.")
-            benign_counts = np.zeros(len(feature_names))
-            n_benign = 1
-
-        adv_counts = np.array(X_adv.sum(axis=0)).flatten()
+        # Vectorizer is already fitted, so we only count against its vocabulary.
+        # An empty benign stream simply yields zero counts; any other error
+        # (e.g. from the joblib workers) propagates.
+        benign_counts, n_benign = self._count_benign(
+            vectorizer, benign_texts, n_features
+        )
+        if n_benign == 0:
+            logger.debug("Benign set empty, assuming 0 benign occurrences.")
+            n_benign = 1  # Avoid division by zero
+
+        # Drop the vectorizer now: its vocabulary dict is usually larger than
+        # X_adv and would stay alive through subsumption and Set Cover.
+        del vectorizer
+
+        adv_counts = np.asarray(X_adv.sum(axis=0)).ravel()
 
         # Differential Scoring
-        # We calculate frequency vectors.
         # Formula: Score = Freq_Adv - (Penalty * Freq_Benign)
-        freq_adv = adv_counts / n_adv
-        freq_benign = benign_counts / n_benign
-
+        # Computed in place in float32: half the memory traffic of float64, and
+        # rules only keep 4 decimals anyway.
+        #
         # Why Subtraction?
         # Ratios (A/B) are unstable for small denominators. Subtraction provides a
         # linear penalty that is easier to reason about.
-        scores = freq_adv - (self.config.benign_penalty_weight * freq_benign)
+        benign_weight = np.float32(self.config.benign_penalty_weight / n_benign)
+        scores = adv_counts.astype(np.float32)
+        scores /= np.float32(n_adv)
+        scores -= benign_weight * benign_counts.astype(np.float32)
 
         max_score = np.max(scores) if len(scores) > 0 else 0.0
         avg_score = np.mean(scores) if len(scores) > 0 else 0.0
 
         logger.info(f"Score Distribution: Max={max_score:.4f}, Mean={avg_score:.4f}")
 
-        if max_score < self.config.score_threshold:
+        # The threshold is rounded like the scores so borderline ties still pass
+        threshold = np.float32(self.config.score_threshold)
+
+        if max_score < threshold:
             logger.warning(
                 f"Highest scoring candidate ({max_score:.4f}) is below the "
                 f"configured threshold ({self.config.score_threshold}). "
                 "No rules will be generated. Try using --mode loose or --threshold."
             )
 
-        # Filter by threshold immediately to reduce data size
-        threshold_mask = scores >= self.config.score_threshold
-
-        # Extract passing candidates
-        candidates = []
-        # We need the indices to keep track of X_adv columns for Set Cover
-        passing_indices = np.where(threshold_mask)[0]
-
-        for idx in passing_indices:
-            candidates.append(
-                {
-                    "text": feature_names[idx],
-                    "score": scores[idx],
-                    "original_index": idx,  # Pointer to the sparse matrix column
-                }
-            )
+        # Filter by threshold immediately to reduce data size.
+        # Candidates are carried as parallel arrays: the X_adv column (needed for
+        # Set Cover), the n-gram text and its score.
+        cand_columns = np.flatnonzero(scores >= threshold)
+        cand_texts = feature_names[cand_columns]
+        cand_scores = scores[cand_columns]
 
-        logger.info(f"Found {len(candidates)} candidates passing score threshold.")
-        if not candidates:
+        logger.info(f"Found {len(cand_columns)} candidates passing score threshold.")
+        if len(cand_columns) == 0:
             return []
 
         # Optimization: Subsumption (String Deduplication)
         # We remove short phrases that are fully contained in longer phrases
         # if the longer phrase has a similar or better score.
-        candidates = self._filter_subsumed(candidates)
-        logger.info(f"Reduced to {len(candidates)} candidates after subsumption check.")
+        keep = self._filter_subsumed(cand_texts, cand_scores)
+        cand_columns = cand_columns[keep]
+        cand_texts = cand_texts[keep]
+        cand_scores = cand_scores[keep]
+        logger.info(f"Reduced to {len(keep)} candidates after subsumption check.")
 
         # Optimization: Greedy Set Cover
         # We select the smallest set of rules that covers the most adversarial samples.
-        selected_candidates = self._greedy_set_cover(candidates, X_adv, n_adv)
-        logger.info(f"Selected top {len(selected_candidates)} rules via Set Cover.")
+        selected = self._greedy_set_cover(cand_columns, cand_texts, X_adv, n_adv)
+        logger.info(f"Selected top {len(selected)} rules via Set Cover.")
 
         # Convert to GeneratedRule objects
         return [
             RuleBuilder.build_from_ngram(
-                text=c["text"],
-                score=c["score"],
+                text=cand_texts[i],
+                score=float(cand_scores[i]),
                 source=source_name,
                 rule_date=self.config.rule_date,
             )
-            for c in selected_candidates
+            for i in selected
         ]
 
-    def _filter_subsumed(
-        self, candidates: list[dict[str, Any]]
-    ) -> list[dict[str, Any]]:
+    def _count_benign(
+        self, vectorizer: Any, texts: Iterable[str], n_features: int
+    ) -> tuple[np.ndarray, int]:
+        """
+        Counts how many benign documents contain each fitted n-gram.
+
+        The benign stream is analyzed in chunks and only the per-feature totals
+        are kept, so the full benign matrix is never materialized. When
+        `config.n_jobs` is not 1, chunks are tokenized in parallel joblib workers,
+        which is where most of the time goes on large control sets.
+
+        Returns:
+            A tuple of (document frequency per feature, number of documents).
+        """
+        from sklearn.base import clone
+
+        # The fitted vocabulary is counted against directly, with the analyzer
+        # built once (hashing mode also ends up with a fitted vocabulary)
+        vocabulary = vectorizer.vocabulary_
+        count_chunk: Callable[[tuple[str, ...]], tuple[np.ndarray, int]]
+        if self.config.n_jobs == 1:
+            count_chunk = partial(
+                _count_chunk_vocabulary, vectorizer.build_analyzer(), vocabulary
+            )
+        else:
+            # Every task is pickled for its worker, so it must not carry the
+            # vocabulary: the packed copy is memory-mapped (and unpacked once
+            # per worker), and the analyzer comes from an unfitted clone because
+            # build_analyzer() binds the vectorizer, vocabulary and all.
+            analyzer = clone(vectorizer).set_params(vocabulary=None).build_analyzer()
+            count_chunk = partial(
+                _count_chunk_packed,
+                analyzer,
+                uuid.uuid4().hex,
+                _pack_vocabulary(vocabulary),
+            )
+
+        chunks = itertools.batched(texts, BENIGN_CHUNK_SIZE, strict=False)
+        partials: Iterable[tuple[np.ndarray, int]]
+        if self.config.n_jobs == 1:
+            partials = map(count_chunk, chunks)
+        else:
+            from joblib import Parallel, delayed
+
+            partials = Parallel(n_jobs=self.config.n_jobs, return_as="generator")(
+                delayed(count_chunk)(chunk) for chunk in chunks
+            )
+
+        counts = np.zeros(n_features, dtype=np.int64)
+        n_docs = 0
+        for chunk_counts, chunk_docs in partials:
+            counts += chunk_counts
+            n_docs += chunk_docs
+        return counts, n_docs
+
+    def _fit_per_order(self, vectorizer: Any, texts: list[str]) -> Any:
+        """
+        Fits one vectorizer per n-gram length in parallel joblib workers.
+
+        Each worker enumerates a single n-gram order, so the token loops run on
+        several cores and each vocabulary stays small. Orders never share
+        features and `min_df` is per feature, so the merged result equals a
+        single fit over the whole `ngram_range`: `vectorizer` is fitted with the
+        merged (alphabetical) vocabulary and the matching matrix is returned.
+
+        Raises:
+            DataError: If no n-gram of any length passes `min_df`.
+        """
+        from joblib import Parallel, delayed
+        from scipy import sparse
+
+        min_n, max_n = vectorizer.ngram_range
+        results = Parallel(n_jobs=self.config.n_jobs)(
+            delayed(_fit_order)(vectorizer, n, texts) for n in range(min_n, max_n + 1)
+        )
+        names = np.concatenate([order_names for order_names, _ in results])
+        if len(names) == 0:
+            raise DataError(
+                "No n-grams met the frequency threshold. "
+                "The adversarial dataset might be too small or too diverse."
+            )
+
+        # Restore CountVectorizer's alphabetical column order
+        columns = np.argsort(names, kind="stable")
+        X_adv = sparse.hstack([X for _, X in results], format="csc")[:, columns]
+        vectorizer.set_params(
+            vocabulary={name: i for i, name in enumerate(names[columns].tolist())}
+        )
+        vectorizer.fit([])
+        return X_adv
+
+    def _hash_adversarial(self, vectorizer: Any, texts: list[str]) -> np.ndarray:
+        """
+        Finds the hash buckets whose document frequency passes `min_df`.
+
+        Unlike CountVectorizer, hashing never builds the n-gram vocabulary, which
+        is what exhausts memory on long corpora, and texts are hashed in chunks
+        so only the per-bucket totals are kept. Colliding n-grams share a bucket,
+        so a bucket's frequency is an upper bound for each of its n-grams.
+
+        Returns:
+            The ids of the kept buckets, in ascending order.
+        """
+        doc_freq = np.zeros(vectorizer.n_features, dtype=np.int64)
+        for chunk in itertools.batched(texts, BENIGN_CHUNK_SIZE, strict=False):
+            doc_freq += np.asarray(vectorizer.transform(chunk).sum(axis=0)).ravel()
+
+        # Same semantics as CountVectorizer: a proportion of the documents
+        min_count = self.config.min_document_frequency * len(texts)
+        buckets = np.flatnonzero(doc_freq >= max(min_count, 1))
+        if len(buckets) == 0:
+            raise DataError(
+                "No n-grams met the frequency threshold. "
+                "The adversarial dataset might be too small or too diverse."
+            )
+        return buckets
+
+    def _resolve_buckets(
+        self, vectorizer: Any, texts: list[str], buckets: np.ndarray
+    ) -> tuple[np.ndarray, Any]:
+        """
+        Resolves hash buckets to the exact n-grams that pass `min_df`.
+
+        Every n-gram passing `min_df` lies in a kept bucket, since bucket counts
+        are upper bounds. The adversarial texts are analyzed again, the documents
+        containing each n-gram of a kept bucket are recorded, and n-grams that do
+        not pass `min_df` on their own (collision passengers) are dropped.
+
+        Returns:
+            A tuple of (n-grams in alphabetical order, CSC document-term matrix),
+            the same vocabulary and matrix a CountVectorizer fit would produce.
+        """
+        from scipy import sparse
+        from sklearn.feature_extraction.text import HashingVectorizer
+
+        analyzer = vectorizer.build_analyzer()
+        # Hashes single n-grams with exactly the bucket function of `vectorizer`
+        hasher = HashingVectorizer(
+            n_features=vectorizer.n_features,
+            alternate_sign=False,
+            norm=None,
+            analyzer=lambda ngram: [ngram],
+        )
+        wanted = set(buckets.tolist())
+        postings: dict[str, list[int]] = {}
+
+        first_doc = 0
+        for chunk in itertools.batched(texts, BENIGN_CHUNK_SIZE, strict=False):
+            doc_ngrams = [set(analyzer(text)) for text in chunk]
+            ngrams = [ngram for ngram_set in doc_ngrams for ngram in ngram_set]
+            docs = [
+                first_doc + i
+                for i, ngram_set in enumerate(doc_ngrams)
+                for _ in range(len(ngram_set))
+            ]
+            first_doc += len(chunk)
+            if not ngrams:
+                continue
+            ngram_buckets = hasher.transform(ngrams).indices.tolist()
+            for ngram, bucket, doc in zip(ngrams, ngram_buckets, docs, strict=True):
+                if bucket in wanted:
+                    postings.setdefault(ngram, []).append(doc)
+
+        min_count = max(self.config.min_document_frequency * len(texts), 1)
+        names = sorted(
+            ngram
+            for ngram, ngram_docs in postings.items()
+            if len(ngram_docs) >= min_count
+        )
+        if not names:
+            raise DataError(
+                "No n-grams met the frequency threshold. "
+                "The adversarial dataset might be too small or too diverse."
+            )
+
+        # Postings are already in document order, i.e. valid CSC column indices
+        indptr = np.zeros(len(names) + 1, dtype=np.int64)
+        np.cumsum([len(postings[name]) for name in names], out=indptr[1:])
+        indices = np.fromiter(
+            itertools.chain.from_iterable(postings[name] for name in names),
+            dtype=np.int64,
+            count=int(indptr[-1]),
+        )
+        X_adv = sparse.csc_matrix(
+            (np.ones(len(indices), dtype=np.int64), indices, indptr),
+            shape=(len(texts), len(names)),
+        )
+        return np.array(names, dtype=object), X_adv
+
+    def _filter_subsumed(self, texts: np.ndarray, scores: np.ndarray) -> np.ndarray:
         """
         Removes shorter n-grams that are substrings of longer n-grams with
         equal/better scores.
@@ -228,32 +549,87 @@ class NgramEngine(BaseEngine[NgramEngineConfig]):
 
         However, if the shorter one has a MUCH better score (e.g. 1.0 vs 0.5),
         we keep the shorter one because the longer one is missing too many attacks.
+
+        Args:
+            texts: Candidate n-gram texts.
+            scores: Candidate scores, parallel to `texts`.
+
+        Returns:
+            Indices into `texts`/`scores` of the kept candidates, longest first.
         """
-        # Sort by length descending (longest first)
-        candidates = sorted(candidates, key=lambda x: len(x["text"]), reverse=True)
-        kept: list[dict[str, Any]] = []
+        text_list = texts.tolist()
+        score_list = scores.tolist()
+
+        # Sort by length descending (longest first), stable like sorted()
+        lengths = np.fromiter(map(len, text_list), dtype=np.int64, count=len(texts))
+        order = np.argsort(-lengths, kind="stable").tolist()
+        if _HAS_AHOCORASICK:
+            return self._filter_subsumed_automaton(order, text_list, score_list)
+
+        kept: list[int] = []
+        # All kept texts in one buffer: a single C-level scan rules out most
+        # candidates before the per-pair loop below.
+        packed = ""
 
         # O(N^2) comparison - acceptable for N < 5000 candidates
-        for _i, short_cand in enumerate(candidates):
+        for short_idx in order:
+            short_text = text_list[short_idx]
+            short_score = score_list[short_idx]
             is_subsumed = False
-            for long_cand in kept:
-                # Check if 'short' is inside 'long'
-                if short_cand["text"] in long_cand["text"]:
-                    # Check scores
-                    # If the longer phrase is at least 95% as effective as the
-                    # short one, we prefer the longer one (safety).
-                    if long_cand["score"] >= (short_cand["score"] * 0.95):
-                        is_subsumed = True
-                        break
+            if short_text in packed:
+                for long_idx in kept:
+                    # Check if 'short' is inside 'long'
+                    if short_text in text_list[long_idx]:
+                        # Check scores
+                        # If the longer phrase is at least 95% as effective as the
+                        # short one, we prefer the longer one (safety).
+                        if score_list[long_idx] >= (short_score * 0.95):
+                            is_subsumed = True
+                            break
 
             if not is_subsumed:
-                kept.append(short_cand)
+                kept.append(short_idx)
+                packed += short_text + "\n"
 
-        return kept
+        return np.array(kept, dtype=np.intp)
+
+    def _filter_subsumed_automaton(
+        self, order: list[int], texts: list[str], scores: list[float]
+    ) -> np.ndarray:
+        """
+        Same result as the pairwise loop in `_filter_subsumed`, but finds every
+        contained candidate with one Aho-Corasick pass over each kept text
+        instead of N substring checks per candidate.
+
+        Args:
+            order: Candidate indices, longest text first.
+            texts: Candidate n-gram texts.
+            scores: Candidate scores, parallel to `texts`.
+        """
+        automaton = ahocorasick.Automaton()
+        for rank, idx in enumerate(order):
+            automaton.add_word(texts[idx], rank)
+        automaton.make_automaton()
+
+        subsumed = [False] * len(order)
+        kept: list[int] = []
+        for rank, long_idx in enumerate(order):
+            if subsumed[rank]:
+                continue
+            kept.append(long_idx)
+
+            # Every shorter candidate inside this one is subsumed if the longer
+            # phrase is at least 95% as effective (see _filter_subsumed)
+            long_score = scores[long_idx]
+            for _end, short_rank in automaton.iter(texts[long_idx]):
+                if short_rank > rank and long_score >= scores[order[short_rank]] * 0.95:
+                    subsumed[short_rank] = True
+
+        return np.array(kept, dtype=np.intp)
 
     def _greedy_set_cover(
-        self, candidates: list[dict[str, Any]], X_adv: Any, total_samples: int
-    ) -> list[dict[str, Any]]:
+        self, columns: np.ndarray, texts: np.ndarray, X_adv: Any, total_samples: int
+    ) -> list[int]:
         """
         Selects candidates based on Marginal Value.
 
@@ -264,58 +640,77 @@ class NgramEngine(BaseEngine[NgramEngineConfig]):
         4. Repeat until no candidate adds significant value.
 
         Args:
-            candidates: List of candidate dicts (must have 'original_index').
+            columns: X_adv column index of each candidate.
+            texts: N-gram text of each candidate, parallel to `columns` (for logs).
             X_adv: The full sparse matrix from CountVectorizer.
             total_samples: Number of adversarial samples.
-        """
-        # Track which samples (rows) have been hit by a selected rule
-        covered_mask = np.zeros(total_samples, dtype=bool)
-        selected: list[dict[str, Any]] = []
-
-        # Pre-compute the column vectors for our filtered candidates to avoid sparse
-        # indexing in loop. Format: {candidate_idx_in_list: dense_boolean_array}
-        candidate_vectors = {}
-        for i, cand in enumerate(candidates):
-            col_idx = cand["original_index"]
-            # Convert sparse column to dense boolean array for fast masking
-            candidate_vectors[i] = X_adv[:, col_idx].toarray().flatten().astype(bool)
-
-        for _ in range(EngineConstants.MAX_RULES_PER_RUN.value):
-            best_candidate_idx = -1
-            best_new_coverage = 0
-
-            # Find the rule that hits the most UNCOVERED samples
-            current_uncovered = ~covered_mask
-
-            # If everything is covered, stop
-            if not np.any(current_uncovered):
-                break
-
-            for i, _ in enumerate(candidates):
-                if i in [x["idx"] for x in selected]:
-                    continue
 
-                hits = candidate_vectors[i]
-                # Logical AND: Hits matches AND Sample is currently uncovered
-                new_hits = np.sum(hits & current_uncovered)
-
-                if new_hits > best_new_coverage:
-                    best_new_coverage = new_hits
-                    best_candidate_idx = i
+        Returns:
+            Positions in `columns` of the selected candidates, in selection order.
+        """
+        selected: list[int] = []
+        if len(columns) == 0:
+            return selected
+
+        # Pack each candidate column into a bitmap of uint64 words (bit i is set
+        # if the candidate hits sample i), built straight from the sparse slice.
+        # A greedy step then costs one popcount per 64 samples instead of one
+        # byte per sample, and no dense (samples x candidates) matrix is needed.
+        n_words = -(-total_samples // 64)
+        X_cand = X_adv.tocsc()[:, columns]  # No copy if extract() passed CSC
+        X_cand.eliminate_zeros()
+        rows = X_cand.indices.astype(np.int64)
+        cols = np.repeat(np.arange(len(columns)), np.diff(X_cand.indptr))
+        bitmaps = np.zeros((len(columns), n_words), dtype=np.uint64)
+        bits = np.left_shift(np.uint64(1), (rows & 63).astype(np.uint64))
+        np.bitwise_or.at(bitmaps, (cols, rows >> 6), bits)
 
-            # Stop if diminishing returns (e.g. rule adds < 0.5% coverage)
-            # For now, we are strict: if it adds NOTHING, stop.
-            if best_candidate_idx == -1 or best_new_coverage == 0:
+        # Track which samples (rows) have been hit by a selected rule
+        uncovered_bits = np.full(n_words, np.iinfo(np.uint64).max, dtype=np.uint64)
+        n_covered = 0
+
+        # Lazy greedy (Minoux): coverage is submodular, so a candidate's new hits
+        # can only shrink as samples get covered. Heap entries are
+        # (-new_hits, position, step evaluated at); stale values are valid upper
+        # bounds, so only the top of the heap ever needs re-evaluating. Ties pop
+        # in position order, matching a plain argmax.
+        total_hits = np.bitwise_count(bitmaps).sum(axis=1).tolist()
+        heap = [(-hits, i, 0) for i, hits in enumerate(total_hits) if hits]
+        heapq.heapify(heap)
+
+        max_rules = EngineConstants.MAX_RULES_PER_RUN.value
+        # If everything is covered, stop
+        while heap and len(selected) < max_rules and n_covered < total_samples:
+            neg_hits, best_candidate_idx, evaluated_at = heapq.heappop(heap)
+            if evaluated_at != len(selected):
+                # Stale bound: recompute against the current coverage. Candidates
+                # that add NOTHING are dropped for good.
+                new_hits = int(
+                    np.bitwise_count(bitmaps[best_candidate_idx] & uncovered_bits).sum()
+                )
+                if new_hits:
+                    heapq.heappush(heap, (-new_hits, best_candidate_idx, len(selected)))
+                continue
+
+            # Stop on diminishing returns: the best rule adds less than
+            # `min_marginal_gain_frac` of the still uncovered samples (at least 1)
+            best_new_coverage = -neg_hits
+            remaining = total_samples - n_covered
+            min_gain = max(1, int(self.config.min_marginal_gain_frac * remaining))
+            if best_new_coverage < min_gain:
+                logger.debug(
+                    f"Stopping: best remaining rule adds {best_new_coverage} of "
+                    f"{remaining} uncovered samples"
+                )
                 break
 
             # Commit the selection
-            selected.append(
-                {"idx": best_candidate_idx, **candidates[best_candidate_idx]}
-            )
-            covered_mask = covered_mask | candidate_vectors[best_candidate_idx]
+            selected.append(best_candidate_idx)
+            uncovered_bits &= ~bitmaps[best_candidate_idx]
+            n_covered += best_new_coverage
 
             logger.debug(
-                f"Selected '{candidates[best_candidate_idx]['text']}' "
+                f"Selected '{texts[best_candidate_idx]}' "
                 f"(New coverage: {best_new_coverage} samples)"
             )
 
@@ -2,18 +2,21 @@ import re
 from pathlib import Path
 
 
-def parse_existing_rules(file_path: Path) -> set[str]:
+def parse_existing_rules(file_path: Path) -> frozenset[str]:
     """
     Parses a YARA file and extracts the string payloads to a set.
 
+    Payloads are matched exactly during deduplication, so a hashed set gives
+    constant-time lookups per generated string.
+
     Args:
         file_path: Path to the existing .yar file.
 
     Returns:
-        A set of string payloads found in the file.
+        An immutable set of string payloads found in the file.
     """
     if not file_path.exists():
-        return set()
+        return frozenset()
 
     content = file_path.read_text(encoding="utf-8")
 
@@ -31,14 +34,9 @@ def parse_existing_rules(file_path: Path) -> set[str]:
     # "                -> Match closing quote
     pattern = re.compile(r'\$[a-zA-Z0-9_]+\s*=\s*"((?:[^"\\]|\\.)*)"')
 
-    matches = pattern.findall(content)
-
-    cleaned_matches = set()
-    for m in matches:
-        # Unescape the YARA string back to raw python string
-        # 1. Replace \" with "
-        # 2. Replace \\ with \
-        unescaped = m.replace('\\"', '"').replace("\\\\", "\\")
-        cleaned_matches.add(unescaped)
-
-    return cleaned_matches
+    # Unescape the YARA strings back to raw python strings
+    # 1. Replace \" with "
+    # 2. Replace \\ with \
+    return frozenset(
+        m.replace('\\"', '"').replace("\\\\", "\\") for m in pattern.findall(content)
+    )
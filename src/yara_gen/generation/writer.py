@@ -1,3 +1,4 @@
+from collections.abc import Iterable
 from datetime import datetime
 from pathlib import Path
 
@@ -25,26 +26,33 @@ class YaraWriter:
         """
         self.template = Template(template_str)
 
-    def write(self, rules: list[GeneratedRule], output_path: Path) -> None:
+    def write(self, rules: Iterable[GeneratedRule], output_path: Path) -> int:
         """
         Renders the rules and writes them to the specified output path.
 
+        The rules may be produced lazily (e.g. by a post-processing generator).
+        The rendered template is streamed to disk chunk by chunk instead of being
+        built as a single string first.
+
         Args:
-            rules: List of generated rules to serialize.
+            rules: Iterable of generated rules to serialize.
             output_path: Destination file path.
+
+        Returns:
+            int: The number of rules written.
         """
-        if not rules:
+        # We need to ensure strings are safe for YARA (escape quotes/backslashes)
+        sanitized_rules = self._sanitize_for_rendering(rules)
+
+        if not sanitized_rules:
             logger.warning(
                 "No rules provided to writer. Output file will not be created."
             )
-            return
+            return 0
 
-        logger.debug(f"Rendering {len(rules)} rules via Jinja2 template...")
+        logger.debug(f"Rendering {len(sanitized_rules)} rules via Jinja2 template...")
 
-        # We need to ensure strings are safe for YARA (escape quotes/backslashes)
-        sanitized_rules = self._sanitize_for_rendering(rules)
-
-        rendered_content = self.template.render(
+        chunks = self.template.generate(
             rules=sanitized_rules,
             timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         )
@@ -53,19 +61,23 @@ class YaraWriter:
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
         with output_path.open("w", encoding="utf-8") as f:
-            f.write(rendered_content)
+            f.writelines(chunks)
 
-        logger.info(f"Successfully wrote {len(rules)} rules to {output_path}")
+        logger.info(f"Successfully wrote {len(sanitized_rules)} rules to {output_path}")
+        return len(sanitized_rules)
 
     def _sanitize_for_rendering(
-        self, rules: list[GeneratedRule]
+        self, rules: Iterable[GeneratedRule]
     ) -> list[GeneratedRule]:
         """
         Prepares rules for the template by escaping special characters in strings.
 
+        The result is a list so that templates can index into it (`rules[0]`).
+
         This prevents broken YARA syntax if a prompt contains quotes like:
         "ignore "previous" instructions" -> "ignore \"previous\" instructions"
         """
+        sanitized = []
         for rule in rules:
             for s in rule.strings:
                 # Escape backslashes first, then quotes
@@ -76,4 +88,6 @@ class YaraWriter:
             for k, v in rule.metadata.items():
                 rule.metadata[k] = str(v).replace('"', '\\"')
 
-        return rules
+            sanitized.append(rule)
+
+        return sanitized
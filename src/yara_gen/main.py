@@ -48,13 +48,13 @@ def main() -> None:
     elif args.command == "optimize":
         input_name = "optimization_run"
 
-    # Sanitize name (remove extension if present, though unlikely for config keys)
-    safe_name = input_name.split(".")[0]
-    log_filename = f"logs_{args.command}_{safe_name}_{timestamp}.log"
-    log_path = f"logs/{log_filename}"
+    # Sanitize name (remove extension if present, though unlikely for config keys).
+    # stem only drops the last suffix, so "data.v2.jsonl" stays "data.v2".
+    safe_name = Path(input_name).stem
+    log_path = Path("logs") / f"logs_{args.command}_{safe_name}_{timestamp}.log"
 
     log_level = "DEBUG" if getattr(args, "verbose", False) else "INFO"
-    logger = setup_logger(level=log_level, log_file=log_path)
+    logger = setup_logger(level=log_level, log_file=str(log_path))
 
     # Logs
     if args.command == "prepare":
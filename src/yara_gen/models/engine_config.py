@@ -1,6 +1,6 @@
 from typing import Annotated, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 from yara_gen.constants import EngineConstants
 
@@ -36,6 +36,24 @@ class NgramEngineConfig(BaseEngineConfig):
 
     min_document_frequency: float = EngineConstants.MIN_DOCUMENT_FREQ.value
 
+    # Set Cover stops once the best rule adds less than this fraction of the
+    # still uncovered samples
+    min_marginal_gain_frac: float = EngineConstants.MIN_MARGINAL_GAIN_FRAC.value
+
+    # Worker processes for benign counting (joblib semantics, -1 = all cores)
+    n_jobs: int = 1
+
+    # Hash n-grams instead of building the full vocabulary (bounded memory)
+    use_hashing: bool = False
+
+    @field_validator("n_jobs")
+    @classmethod
+    def _check_n_jobs(cls, value: int) -> int:
+        # joblib rejects 0; negative values count back from the number of cores
+        if value == 0:
+            raise ValueError("n_jobs must be a positive number of workers or -1")
+        return value
+
 
 class StubEngineConfig(BaseEngineConfig):
     """
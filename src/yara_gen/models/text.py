@@ -22,6 +22,10 @@ class TextSample(BaseModel):
     dataset_type: DatasetType
     metadata: dict[str, Any] = Field(default_factory=dict)
 
+    # Serialize NaN/Infinity in metadata as JSON constants (as json.dumps does)
+    # instead of pydantic's default of null
+    model_config = {"ser_json_inf_nan": "constants"}
+
     def to_dict(self) -> dict[str, Any]:
         """
         Serializes the sample to a JSON-compatible dictionary.
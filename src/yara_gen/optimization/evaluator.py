@@ -1,4 +1,3 @@
-import json
 from pathlib import Path
 
 import yara
@@ -6,6 +5,7 @@ import yara
 from yara_gen.generation.writer import YaraWriter
 from yara_gen.models.evaluator import EvaluationMetrics
 from yara_gen.models.text import GeneratedRule
+from yara_gen.utils.json_fast import loads
 from yara_gen.utils.logger import get_logger
 
 logger = get_logger()
@@ -68,7 +68,7 @@ class Evaluator:
                 if not line.strip():
                     continue
 
-                record = json.loads(line)
+                record = loads(line)
                 text = record.get("text", "")
                 label = record.get("label", "benign")  # Default to benign if missing
 
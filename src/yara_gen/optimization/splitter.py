@@ -1,10 +1,10 @@
-import json
 import random
 from collections.abc import Iterable
 from pathlib import Path
-from typing import TextIO
+from typing import BinaryIO
 
 from yara_gen.models.text import TextSample
+from yara_gen.utils.json_fast import dumps_line
 from yara_gen.utils.logger import get_logger
 
 logger = get_logger()
@@ -77,7 +77,7 @@ class DataSplitter:
         # Process Adversarial
         with (
             open(self.train_adv_path, "a", encoding="utf-8") as f_train,
-            open(self.dev_path, "a", encoding="utf-8") as f_dev,
+            open(self.dev_path, "ab") as f_dev,
         ):
             for sample in adv_stream:
                 if self._rng.random() < split_ratio:
@@ -92,7 +92,7 @@ class DataSplitter:
         # Process Benign
         with (
             open(self.train_benign_path, "a", encoding="utf-8") as f_train,
-            open(self.dev_path, "a", encoding="utf-8") as f_dev,
+            open(self.dev_path, "ab") as f_dev,
         ):
             for sample in benign_stream:
                 if self._rng.random() < split_ratio:
@@ -108,7 +108,7 @@ class DataSplitter:
         return stats
 
     def _write_labeled(
-        self, file_handle: TextIO, sample: TextSample, label: str
+        self, file_handle: BinaryIO, sample: TextSample, label: str
     ) -> None:
         """
         Writes a sample to the development file with an explicit ground-truth label.
@@ -118,10 +118,11 @@ class DataSplitter:
         from False Positives), and writes it as a JSON line.
 
         Args:
-            file_handle (TextIO): The open file handle for the development set.
+            file_handle (BinaryIO): The open binary file handle for the development
+                set.
             sample (TextSample): The text sample to write.
             label (str): The classification label (e.g. "adversarial", "benign").
         """
         data = sample.model_dump()
         data["label"] = label
-        file_handle.write(json.dumps(data) + "\n")
+        file_handle.write(dumps_line(data))
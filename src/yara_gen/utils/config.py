@@ -1,4 +1,5 @@
 import copy
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -67,6 +68,39 @@ def _parse_value(value: str) -> str | int | float | bool:
     return value
 
 
+@lru_cache(maxsize=128)
+def _compile_overrides(
+    overrides: tuple[str, ...],
+) -> tuple[tuple[tuple[str, ...], str | int | float | bool], ...]:
+    """
+    Parse override strings into (key path, typed value) pairs.
+
+    The result is cached per distinct override tuple, so repeated calls with the
+    same `--set` arguments only split and type-convert the strings once.
+
+    Args:
+        overrides (tuple[str, ...]): Strings in 'key.subkey=value' format.
+
+    Returns:
+        tuple[tuple[tuple[str, ...], str | int | float | bool], ...]: One
+            (key path, parsed value) pair per override, in input order.
+
+    Raises:
+        ConfigurationError: If an override string is malformed.
+    """
+    compiled = []
+    for override in overrides:
+        if "=" not in override:
+            raise ConfigurationError(
+                f"Invalid override format: '{override}'. Expected 'key.subkey=value'."
+            )
+
+        key_path, value_str = override.split("=", 1)
+        compiled.append((tuple(key_path.split(".")), _parse_value(value_str)))
+
+    return tuple(compiled)
+
+
 def apply_overrides(
     config: dict[str, Any], overrides: list[str] | None
 ) -> dict[str, Any]:
@@ -98,19 +132,10 @@ def apply_overrides(
     # Deep copy to ensure we don't mutate the original dictionary reference
     updated_config = copy.deepcopy(config)
 
-    for override in overrides:
-        if "=" not in override:
-            raise ConfigurationError(
-                f"Invalid override format: '{override}'. Expected 'key.subkey=value'."
-            )
-
-        key_path, value_str = override.split("=", 1)
-        keys = key_path.split(".")
-        value = _parse_value(value_str)
-
+    for keys, value in _compile_overrides(tuple(overrides)):
         # Traverse and create structure
         current_level = updated_config
-        for _, key in enumerate(keys[:-1]):
+        for key in keys[:-1]:
             if key not in current_level:
                 current_level[key] = {}
 
@@ -118,7 +143,7 @@ def apply_overrides(
                 # If we encounter a non-dict at an intermediate step, we can't
                 # traverse deeper. Example: config['a'] = 1, override is 'a.b=2'
                 raise ConfigurationError(
-                    f"Cannot set '{key_path}': '{key}' is not a dictionary."
+                    f"Cannot set '{'.'.join(keys)}': '{key}' is not a dictionary."
                 )
 
             current_level = current_level[key]
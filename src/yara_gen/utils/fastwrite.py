@@ -0,0 +1,101 @@
+import os
+from pathlib import Path
+from types import TracebackType
+from typing import BinaryIO, Self
+
+# Vectored writes are only available on POSIX platforms
+_HAS_WRITEV = hasattr(os, "writev")
+
+# Upper bound for buffers per writev() call, well below IOV_MAX (1024 on Linux)
+_MAX_IOVECS = 512
+
+DEFAULT_FLUSH_SIZE = 1 << 20  # 1 MiB
+
+
+class ChunkWriter:
+    """
+    Append-only binary file writer for bulk output such as JSONL exports.
+
+    Written chunks are collected as-is and flushed with a single vectored write
+    (`os.writev`) once `flush_size` bytes are pending. Unlike a BufferedWriter,
+    the chunks are never copied into an intermediate buffer. On platforms without
+    `os.writev` a regular buffered file is used instead.
+    """
+
+    def __init__(self, path: Path, flush_size: int = DEFAULT_FLUSH_SIZE):
+        """
+        Opens (and truncates) the output file.
+
+        Args:
+            path: Destination file path.
+            flush_size: Number of pending bytes that triggers a flush.
+
+        Raises:
+            OSError: If the file cannot be opened for writing.
+        """
+        self.flush_size = flush_size
+        self._chunks: list[bytes] = []
+        self._pending = 0
+        self._fd: int | None = None
+        self._file: BinaryIO | None = None
+
+        if _HAS_WRITEV:
+            self._fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        else:
+            self._file = path.open("wb", buffering=flush_size)
+
+    def write(self, data: bytes) -> None:
+        """Queues `data` for writing, flushing once enough bytes are pending."""
+        if self._file is not None:
+            self._file.write(data)
+            return
+
+        self._chunks.append(data)
+        self._pending += len(data)
+        if self._pending >= self.flush_size or len(self._chunks) >= _MAX_IOVECS:
+            self.flush()
+
+    def flush(self) -> None:
+        """Writes all pending chunks to the file."""
+        if self._file is not None:
+            self._file.flush()
+            return
+
+        assert self._fd is not None
+        chunks = self._chunks
+        while chunks:
+            written = os.writev(self._fd, chunks)
+
+            # writev() may stop early: drop the fully written chunks and keep
+            # the unwritten tail of a partially written one
+            done = 0
+            while done < len(chunks) and written >= len(chunks[done]):
+                written -= len(chunks[done])
+                done += 1
+            del chunks[:done]
+            if written:
+                chunks[0] = chunks[0][written:]
+
+        self._pending = 0
+
+    def close(self) -> None:
+        """Flushes pending chunks and closes the file."""
+        try:
+            self.flush()
+        finally:
+            if self._file is not None:
+                self._file.close()
+            elif self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
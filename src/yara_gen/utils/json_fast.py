@@ -0,0 +1,66 @@
+"""
+JSON (de)serialization helpers for JSONL hot paths.
+
+Uses `orjson` when it is installed (`pip install "yara-gen[fast]"`) and falls back
+to the standard library otherwise. Both backends encode the same values (NaN and
+Infinity included; only whitespace differs) and accept the same documents, and
+decode errors are always instances of `json.JSONDecodeError`.
+"""
+
+import json
+import math
+from typing import Any
+
+JSONDecodeError = json.JSONDecodeError
+
+
+def _dumps_line_json(obj: Any) -> bytes:
+    """Standard library implementation of `dumps_line`."""
+    return (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _has_non_finite(obj: Any) -> bool:
+    """Whether `obj` contains a NaN or infinite float (at any depth)."""
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(map(_has_non_finite, obj.values()))
+    if isinstance(obj, list | tuple):
+        return any(map(_has_non_finite, obj))
+    return False
+
+
+try:
+    import orjson
+
+    def loads(data: str | bytes) -> Any:
+        """Parses a JSON document."""
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson rejects NaN/Infinity and lone surrogate escapes, which the
+            # standard library accepts; retry there so no record is dropped
+            return json.loads(data)
+
+    def dumps_line(obj: Any) -> bytes:
+        """Serializes `obj` to a UTF-8 encoded JSONL line (with trailing newline)."""
+        # Non-string keys are stringified, as the standard library does
+        line = orjson.dumps(
+            obj, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+        )
+        # orjson writes NaN/Infinity as null; such lines go through the standard
+        # library, which keeps them. The substring check keeps the walk off the
+        # common path.
+        if b"null" in line and _has_non_finite(obj):
+            return _dumps_line_json(obj)
+        return line
+
+except ImportError:
+
+    def loads(data: str | bytes) -> Any:
+        """Parses a JSON document."""
+        return json.loads(data)
+
+    def dumps_line(obj: Any) -> bytes:
+        """Serializes `obj` to a UTF-8 encoded JSONL line (with trailing newline)."""
+        return _dumps_line_json(obj)
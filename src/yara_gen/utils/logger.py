@@ -1,12 +1,100 @@
+import io
 import json
 import logging
+import os
 import sys
+import threading
 from typing import Any
 
 from yara_gen.constants import LOGGER_NAME, META_AUTHOR
 
 LOG_FORMAT = "[%(levelname)s] %(asctime)s %(message)s"
 DATE_FORMAT = "%H:%M:%S"
+FILE_BUFFER_SIZE = 1 << 16
+# Longest time (seconds) a buffered file record may wait before it is written
+FILE_FLUSH_INTERVAL = 5.0
+
+# logging never discards loggers, so the application logger can be bound once
+_DEFAULT_LOGGER = logging.getLogger(LOGGER_NAME)
+
+# Names of loggers setup_logger has already configured
+_CONFIGURED: set[str] = set()
+
+# Level names accepted by setup_logger (including logging's aliases)
+_LEVELS = {
+    name: getattr(logging, name)
+    for name in (
+        "CRITICAL",
+        "FATAL",
+        "ERROR",
+        "WARNING",
+        "WARN",
+        "INFO",
+        "DEBUG",
+        "NOTSET",
+    )
+}
+
+# Shared by every handler; formatters are stateless, so one instance is enough
+_FORMATTER = logging.Formatter(LOG_FORMAT, datefmt=DATE_FORMAT)
+
+_HEADER_WIDTH = 80
+_HEADER_BORDER = "+" + "=" * (_HEADER_WIDTH - 2) + "+"
+# Centered box line; "^" matches str.center() for the even inner width
+_HEADER_LINE_FMT = f"| {{:^{_HEADER_WIDTH - 4}}} |"
+_HEADER_AUTHOR = _HEADER_LINE_FMT.format(f"by {META_AUTHOR}")
+
+
+class _BufferedFileHandler(logging.FileHandler):
+    """
+    FileHandler that lets records accumulate in a 64 KiB write buffer.
+
+    StreamHandler flushes the stream after every record, which costs one write
+    syscall per log line. Here only WARNING and above flush immediately; everything
+    else is written when the buffer fills, by a background flush at most
+    FILE_FLUSH_INTERVAL seconds later, or when the handler is closed (which
+    logging.shutdown() does at exit). A killed process therefore loses at most
+    the last few seconds of INFO/DEBUG lines.
+    """
+
+    _deferring = False
+    _stop_flushing: threading.Event | None = None
+
+    def _open(self) -> io.TextIOWrapper:
+        raw = io.FileIO(self.baseFilename, self.mode)
+        stream = io.TextIOWrapper(
+            io.BufferedWriter(raw, buffer_size=FILE_BUFFER_SIZE),
+            encoding=self.encoding,
+            errors=self.errors,
+        )
+        self._stop_flushing = threading.Event()
+        threading.Thread(
+            target=self._flush_periodically,
+            args=(self._stop_flushing,),
+            name="log-file-flush",
+            daemon=True,
+        ).start()
+        return stream
+
+    def _flush_periodically(self, stop: threading.Event) -> None:
+        while not stop.wait(FILE_FLUSH_INTERVAL):
+            self.flush()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self._deferring = record.levelno < logging.WARNING
+        try:
+            super().emit(record)
+        finally:
+            self._deferring = False
+
+    def flush(self) -> None:
+        if not self._deferring:
+            super().flush()
+
+    def close(self) -> None:
+        if self._stop_flushing is not None:
+            self._stop_flushing.set()
+        super().close()
 
 
 def setup_logger(
@@ -15,51 +103,47 @@ def setup_logger(
     """
     Configures the application-wide logger with console and optional file handlers.
 
-    Sets the global logging level to DEBUG to capture all events, while allowing
-    individual handlers to filter based on the provided `level`.
+    The level is set on the logger only; handlers are left at NOTSET so they
+    follow it, including when the logger level is changed later.
 
     Args:
-        level (str): The logging level for the console handler (e.g. "INFO", "DEBUG").
+        level (str): The logging level for the logger (e.g. "INFO", "DEBUG").
             Defaults to "INFO".
         log_file (str | None): Optional path to a file where logs should be saved.
-            File logs are always written at DEBUG level.
+            File logs use the same level as the console.
 
     Returns:
         logging.Logger: The configured logger instance.
     """
     logger = logging.getLogger(name)
 
-    # If logger already has handlers, assume it's set up and return it
-    # (Prevents duplicate logs if called multiple times)
-    if logger.handlers:
+    # Configure each logger once and return it as-is afterwards
+    # (Prevents duplicate logs if called multiple times, even with another log_file)
+    if name in _CONFIGURED:
         return logger
 
-    # Set level
-    numeric_level = getattr(logging, level.upper(), logging.INFO)
-    logger.setLevel(numeric_level)
-
     # Create console handler (standard output)
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(numeric_level)
 
-    # Create formatter
-    formatter = logging.Formatter(LOG_FORMAT, datefmt=DATE_FORMAT)
-    console_handler.setFormatter(formatter)
-
-    # Add console handler
-    logger.addHandler(console_handler)
+    console_handler.setFormatter(_FORMATTER)
+    handlers: list[logging.Handler] = [console_handler]
 
     # Create file handler if requested
     if log_file:
-        from pathlib import Path
+        os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
 
-        file_path = Path(log_file)
-        file_path.parent.mkdir(parents=True, exist_ok=True)
+        # delay=True: the file is only opened once a record is actually written
+        file_handler = _BufferedFileHandler(log_file, encoding="utf-8", delay=True)
+        file_handler.setFormatter(_FORMATTER)
+        handlers.append(file_handler)
 
-        file_handler = logging.FileHandler(file_path, encoding="utf-8")
-        file_handler.setLevel(numeric_level)
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+    # Nothing is attached (or marked as configured) until every handler was
+    # created, so a failed setup leaves the logger untouched and can be retried
+    numeric_level = _LEVELS.get(level.upper(), logging.INFO)
+    logger.setLevel(numeric_level)
+    for handler in handlers:
+        logger.addHandler(handler)
+    _CONFIGURED.add(name)
 
     return logger
 
@@ -71,6 +155,8 @@ def get_logger(name: str = LOGGER_NAME) -> logging.Logger:
     Returns:
         logging.Logger: The logger instance associated with the constant LOGGER_NAME.
     """
+    if name == LOGGER_NAME:
+        return _DEFAULT_LOGGER
     return logging.getLogger(name)
 
 
@@ -83,17 +169,11 @@ def log_header(logger: logging.Logger, title: str = "YARA Gen") -> None:
         title (str): The title text to display centered within the header box.
             Defaults to "YARA Gen".
     """
-    width = 80
-    border = "+" + "=" * (width - 2) + "+"
-
-    # Center the title
-    padded_title = f"{title}".center(width - 4)
-    padded_author = f"by {META_AUTHOR}".center(width - 4)
-
-    print(border)
-    print(f"| {padded_title} |")
-    print(f"| {padded_author} |")
-    print(border)
+    # One write for the whole box instead of a print() per line
+    sys.stdout.write(
+        f"{_HEADER_BORDER}\n{_HEADER_LINE_FMT.format(title)}\n"
+        f"{_HEADER_AUTHOR}\n{_HEADER_BORDER}\n"
+    )
 
 
 def log_named_value(logger: logging.Logger, key: str, value: Any) -> None:
@@ -108,8 +188,8 @@ def log_named_value(logger: logging.Logger, key: str, value: Any) -> None:
         key (str): The label for the value (will be padded for alignment).
         value (Any): The value to display.
     """
-    # Just a simple consistent alignment
-    logger.info(f"{key:<12}: {value}")
+    # Just a simple consistent alignment (formatted only if the record is emitted)
+    logger.info("%-12s: %s", key, value)
 
 
 def log_config(logger: logging.Logger, config: dict[str, Any]) -> None:
@@ -120,5 +200,9 @@ def log_config(logger: logging.Logger, config: dict[str, Any]) -> None:
         logger (logging.Logger): The logger instance to use.
         config (dict[str, Any]): The dictionary containing configuration data to log.
     """
-    logger.info("Configuration:")
-    logger.info(json.dumps(config, indent=2, default=str))
+    # Skip the JSON dump entirely when INFO is filtered out
+    if not logger.isEnabledFor(logging.INFO):
+        return
+
+    # One record for the whole block: a single lock/format/write round-trip
+    logger.info("Configuration:\n%s", json.dumps(config, indent=2, default=str))
@@ -26,3 +26,7 @@ class TestAdapterFactory:
         assert "jsonl" in ADAPTER_MAP
         assert "generic-csv" in ADAPTER_MAP
         assert "huggingface" in ADAPTER_MAP
+
+    def test_adapter_map_is_read_only(self):
+        with pytest.raises(TypeError):
+            ADAPTER_MAP["custom"] = JSONLAdapter  # type: ignore[index]
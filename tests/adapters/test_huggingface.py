@@ -1,8 +1,16 @@
+from typing import Any
+
 import pytest
+from datasets import Dataset, IterableDataset
 
 from yara_gen.adapters.huggingface import HuggingFaceAdapter
 from yara_gen.errors import DataError
-from yara_gen.models.text import DatasetType
+from yara_gen.models.text import DatasetType, TextSample
+
+
+def _as_stream(rows: list[dict[str, Any]], num_shards: int = 1) -> IterableDataset:
+    """Wraps plain rows in a real streaming dataset, as returned by the Hub."""
+    return Dataset.from_list(rows).to_iterable_dataset(num_shards=num_shards)
 
 
 class TestHuggingFaceAdapter:
@@ -19,8 +27,8 @@ class TestHuggingFaceAdapter:
         ]
 
         # We patch the function where it is imported/used
-        mock_load_dataset = mocker.patch("yara_gen.adapters.huggingface.load_dataset")
-        mock_load_dataset.return_value = mock_data
+        mock_load_dataset = mocker.patch("datasets.load_dataset")
+        mock_load_dataset.return_value = _as_stream(mock_data)
 
         # We pass a string ID
         samples = list(adapter.load("deepset/test-dataset"))
@@ -31,16 +39,51 @@ class TestHuggingFaceAdapter:
 
         assert "text" not in samples[0].metadata
 
+        # Unvalidated construction must produce the same sample as validation
+        expected = TextSample(
+            text="attack one",
+            source="deepset/test-dataset",
+            dataset_type=DatasetType.ADVERSARIAL,
+            metadata={"label": "unsafe"},
+        )
+        assert samples[0].to_dict() == expected.to_dict()
+
         # Verify call args
         mock_load_dataset.assert_called_with(
             "deepset/test-dataset", name=None, split="train", streaming=True
         )
 
+    def test_load_spans_multiple_batches(self, adapter, mocker):
+        """Rows from every Arrow batch are yielded in order, with their metadata."""
+        mock_data = [{"text": f"attack {i}", "id": i} for i in range(2500)]
+        mock_load_dataset = mocker.patch("datasets.load_dataset")
+        mock_load_dataset.return_value = _as_stream(mock_data)
+
+        samples = list(adapter.load("user/large-repo"))
+
+        assert len(samples) == 2500
+        assert samples[-1].text == "attack 2499"
+        assert samples[-1].metadata == {"id": 2499}
+
+    def test_load_streams_shards_in_parallel(self, adapter, mocker):
+        """With num_workers, every row of every shard is yielded exactly once."""
+        mock_data = [{"text": f"attack {i}"} for i in range(40)]
+        mock_load_dataset = mocker.patch("datasets.load_dataset")
+        mock_load_dataset.return_value = _as_stream(mock_data, num_shards=4)
+
+        samples = list(adapter.load("user/sharded-repo", num_workers=4))
+
+        assert sorted(s.text for s in samples) == sorted(r["text"] for r in mock_data)
+        # Adapter-only options must not leak into load_dataset()
+        mock_load_dataset.assert_called_with(
+            "user/sharded-repo", name=None, split="train", streaming=True
+        )
+
     def test_load_with_custom_column_and_split(self, adapter, mocker):
         """Test specifying a custom column and split."""
         mock_data = [{"content": "malicious payload", "id": 1}]
-        mock_load_dataset = mocker.patch("yara_gen.adapters.huggingface.load_dataset")
-        mock_load_dataset.return_value = mock_data
+        mock_load_dataset = mocker.patch("datasets.load_dataset")
+        mock_load_dataset.return_value = _as_stream(mock_data)
 
         samples = list(adapter.load("user/repo", column="content", split="validation"))
 
@@ -57,8 +100,8 @@ class TestHuggingFaceAdapter:
     def test_fallback_to_prompt_column(self, adapter, mocker):
         """Test heuristic fallback: if 'text' is missing, try 'prompt'."""
         mock_data = [{"prompt": "ignore instructions", "category": "jailbreak"}]
-        mock_load_dataset = mocker.patch("yara_gen.adapters.huggingface.load_dataset")
-        mock_load_dataset.return_value = mock_data
+        mock_load_dataset = mocker.patch("datasets.load_dataset")
+        mock_load_dataset.return_value = _as_stream(mock_data)
 
         samples = list(adapter.load("rubend18/test"))
 
@@ -72,8 +115,8 @@ class TestHuggingFaceAdapter:
     def test_fallback_to_capitalized_prompt_column(self, adapter, mocker):
         """Test heuristic fallback to 'Prompt' (capitalized) and metadata exclusion."""
         mock_data = [{"Prompt": "Do anything now", "other_field": "123"}]
-        mock_load_dataset = mocker.patch("yara_gen.adapters.huggingface.load_dataset")
-        mock_load_dataset.return_value = mock_data
+        mock_load_dataset = mocker.patch("datasets.load_dataset")
+        mock_load_dataset.return_value = _as_stream(mock_data)
 
         samples = list(adapter.load("user/repo"))
 
@@ -84,9 +127,31 @@ class TestHuggingFaceAdapter:
         assert "Prompt" not in samples[0].metadata
         assert samples[0].metadata["other_field"] == "123"
 
+    def test_fallback_to_prompt_when_text_column_is_empty(self, adapter, mocker):
+        """A present but empty 'text' value falls back to 'prompt', per row."""
+        mock_data: list[dict[str, Any]] = [
+            {"text": None, "prompt": "ignore instructions"},
+            {"text": "", "prompt": "do anything now"},
+            {"text": "attack three", "prompt": "unused"},
+            {"text": None, "prompt": None},
+        ]
+        mock_load_dataset = mocker.patch("datasets.load_dataset")
+        mock_load_dataset.return_value = _as_stream(mock_data)
+
+        samples = list(adapter.load("test/repo"))
+
+        assert [s.text for s in samples] == [
+            "ignore instructions",
+            "do anything now",
+            "attack three",
+        ]
+        assert samples[0].metadata == {"text": None}
+        assert samples[1].metadata == {"text": ""}
+        assert samples[2].metadata == {"prompt": "unused"}
+
     def test_hf_load_failure(self, adapter, mocker):
         """Test that connection errors raise a ValueError."""
-        mock_load_dataset = mocker.patch("yara_gen.adapters.huggingface.load_dataset")
+        mock_load_dataset = mocker.patch("datasets.load_dataset")
         mock_load_dataset.side_effect = Exception("Connection refused")
 
         with pytest.raises(DataError, match="Could not load Hugging Face dataset"):
@@ -95,8 +160,8 @@ class TestHuggingFaceAdapter:
     def test_load_with_config_name(self, adapter, mocker):
         """Test loading with a specific config name."""
         mock_data = [{"text": "config sample"}]
-        mock_load_dataset = mocker.patch("yara_gen.adapters.huggingface.load_dataset")
-        mock_load_dataset.return_value = mock_data
+        mock_load_dataset = mocker.patch("datasets.load_dataset")
+        mock_load_dataset.return_value = _as_stream(mock_data)
 
         samples = list(adapter.load("user/multi-config-repo", config_name="subset_v2"))
 
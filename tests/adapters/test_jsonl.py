@@ -67,3 +67,12 @@ class TestJSONLAdapter:
 
         samples = list(adapter.load(f))
         assert len(samples) == 2
+
+    def test_skips_invalid_utf8_lines(self, adapter, tmp_path):
+        """A line with broken encoding is skipped instead of aborting the file."""
+        f = tmp_path / "mixed.jsonl"
+        f.write_bytes(b'{"text": "caf\xc3\xa9"}\n{"text": "bad \xff"}\n{"text": "B"}\n')
+
+        samples = list(adapter.load(f))
+
+        assert [s.text for s in samples] == ["café", "B"]
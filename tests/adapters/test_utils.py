@@ -0,0 +1,70 @@
+from collections.abc import Iterator
+
+import pytest
+
+from yara_gen.adapters.utils import filter_stream, prefetch
+from yara_gen.models.text import DatasetType, TextSample
+
+
+def _sample(text: str, **metadata: object) -> TextSample:
+    return TextSample(
+        text=text, source="src", dataset_type=DatasetType.RAW, metadata=metadata
+    )
+
+
+class TestFilterStream:
+    def test_compares_metadata_as_strings(self):
+        """Numeric metadata matches its string form (e.g. 1 == "1")."""
+        samples = [_sample("a", label=1), _sample("b", label=0), _sample("c")]
+
+        kept = list(filter_stream(samples, "label", "1"))
+
+        assert [s.text for s in kept] == ["a"]
+
+    def test_falls_back_to_core_attributes(self):
+        samples = [_sample("a"), _sample("b")]
+
+        assert len(list(filter_stream(samples, "source", "src"))) == 2
+        assert len(list(filter_stream(samples, "dataset_type", "raw"))) == 2
+        assert list(filter_stream(samples, "source", "other")) == []
+
+
+class TestPrefetch:
+    def test_preserves_order(self):
+        """All items are yielded in their original order."""
+        assert list(prefetch(range(100), buffer_size=3)) == list(range(100))
+
+    def test_inline_when_disabled(self):
+        """A buffer size of 0 iterates without a worker thread."""
+        assert list(prefetch(iter("abc"), buffer_size=0)) == ["a", "b", "c"]
+
+    def test_reraises_producer_errors(self):
+        """Errors raised while producing surface in the consuming thread."""
+
+        def failing() -> Iterator[int]:
+            yield 1
+            raise ConnectionError("network dropped")
+
+        stream = prefetch(failing())
+
+        assert next(stream) == 1
+        with pytest.raises(ConnectionError, match="network dropped"):
+            next(stream)
+
+    def test_early_close_stops_worker(self):
+        """Closing the consumer early does not block on a full buffer."""
+        produced = []
+
+        def endless() -> Iterator[int]:
+            i = 0
+            while True:
+                produced.append(i)
+                yield i
+                i += 1
+
+        stream = prefetch(endless(), buffer_size=1)
+        assert next(stream) == 0
+        stream.close()
+
+        # The worker can only run a bounded distance ahead of the consumer
+        assert len(produced) < 10
@@ -1,4 +1,6 @@
 import argparse
+import json
+from collections.abc import Iterator
 from pathlib import Path
 from unittest.mock import MagicMock
 
@@ -7,7 +9,8 @@ from pytest_mock import MockerFixture
 
 from yara_gen.cli.commands.prepare import run
 from yara_gen.constants import AdapterType
-from yara_gen.models.text import DatasetType
+from yara_gen.errors import DataError
+from yara_gen.models.text import DatasetType, TextSample
 
 
 @pytest.fixture
@@ -61,10 +64,8 @@ def test_prepare_command_limit(
 
     # Mock adapter returning infinite stream (or large list)
     mock_adapter = MagicMock()
-    # Mock objects conforming to .to_dict()
-    mock_item = MagicMock()
-    mock_item.to_dict.return_value = {"text": "foo"}
-    mock_adapter.load.return_value = [mock_item] * 10
+    sample = TextSample(text="foo", source="test", dataset_type=DatasetType.RAW)
+    mock_adapter.load.return_value = [sample] * 10
 
     mocker.patch("yara_gen.cli.commands.prepare.get_adapter", return_value=mock_adapter)
 
@@ -77,6 +78,80 @@ def test_prepare_command_limit(
     assert len(lines) == 2
 
 
+def test_prepare_command_writes_partial_blocks(
+    run_args: argparse.Namespace, mocker: MockerFixture
+) -> None:
+    """Samples are written in blocks; the trailing partial block is not lost."""
+    mocker.patch("yara_gen.cli.commands.prepare.WRITE_BLOCK_SIZE", 3)
+
+    items = [
+        TextSample(
+            text=f"foo {i}",
+            source="test",
+            dataset_type=DatasetType.RAW,
+            metadata={"n": i, "lang": "dé"},
+        )
+        for i in range(10)
+    ]
+
+    mock_adapter = MagicMock()
+    mock_adapter.load.return_value = items
+    mocker.patch("yara_gen.cli.commands.prepare.get_adapter", return_value=mock_adapter)
+
+    run(run_args)
+
+    with run_args.output.open() as f:
+        lines = f.read().splitlines()
+
+    # Every line matches the sample's documented dict form
+    assert [json.loads(line) for line in lines] == [item.to_dict() for item in items]
+
+
+def test_prepare_command_output_format(
+    run_args: argparse.Namespace, mocker: MockerFixture
+) -> None:
+    """Lines are compact, UTF-8 and keep NaN/Infinity as JSON constants."""
+    sample = TextSample(
+        text="héllo",
+        source="test",
+        dataset_type=DatasetType.RAW,
+        metadata={"score": float("nan"), "limit": float("inf")},
+    )
+    mock_adapter = MagicMock()
+    mock_adapter.load.return_value = [sample]
+    mocker.patch("yara_gen.cli.commands.prepare.get_adapter", return_value=mock_adapter)
+
+    run(run_args)
+
+    assert run_args.output.read_text(encoding="utf-8") == (
+        '{"text":"héllo","source":"test","dataset_type":"raw",'
+        '"metadata":{"score":NaN,"limit":Infinity}}\n'
+    )
+
+
+def test_prepare_command_keeps_samples_read_before_stream_error(
+    run_args: argparse.Namespace, mocker: MockerFixture
+) -> None:
+    """A mid-stream error exits, but already read samples are written."""
+
+    def failing_stream() -> Iterator[TextSample]:
+        for i in range(5):
+            yield TextSample(
+                text=f"foo {i}", source="test", dataset_type=DatasetType.RAW
+            )
+        raise DataError("Stream interrupted")
+
+    mock_adapter = MagicMock()
+    mock_adapter.load.return_value = failing_stream()
+    mocker.patch("yara_gen.cli.commands.prepare.get_adapter", return_value=mock_adapter)
+
+    with pytest.raises(SystemExit):
+        run(run_args)
+
+    with run_args.output.open() as f:
+        assert len(f.readlines()) == 5
+
+
 def test_prepare_command_adapter_config_override(
     run_args: argparse.Namespace, mocker: MockerFixture
 ) -> None:
@@ -0,0 +1,25 @@
+import pytest
+
+from yara_gen.cli.utils import parse_filter_arg, parse_filter_args
+
+
+def test_parse_filter_arg_strips_whitespace():
+    assert parse_filter_arg(" label = 1 ") == ("label", "1")
+
+
+def test_parse_filter_arg_splits_at_first_equals():
+    assert parse_filter_arg("query=a=b") == ("query", "a=b")
+
+
+def test_parse_filter_arg_empty_returns_none():
+    assert parse_filter_arg(None) == (None, None)
+    assert parse_filter_arg("") == (None, None)
+
+
+def test_parse_filter_arg_rejects_missing_equals():
+    with pytest.raises(ValueError, match="column=value"):
+        parse_filter_arg("label")
+
+
+def test_parse_filter_args_builds_mapping():
+    assert parse_filter_args(["label=1", "lang = en"]) == {"label": "1", "lang": "en"}
@@ -1,7 +1,7 @@
 import argparse
 from unittest.mock import MagicMock
 
-from yara_gen.cli.commands.generate import run
+from yara_gen.cli.commands.generate import _post_process_rules, run
 from yara_gen.models.config import AppConfig
 from yara_gen.models.text import GeneratedRule, RuleString
 
@@ -56,7 +56,7 @@ def test_metadata_injection(mocker):
     # Asset
     # Check that _write_results was called with rules containing merged metadata
     assert mock_write.called
-    rules = mock_write.call_args[0][0]
+    rules = list(mock_write.call_args[0][0])
     assert len(rules) == 1
     rule = rules[0]
 
@@ -68,3 +68,29 @@ def test_metadata_injection(mocker):
     # Tags should be merged
     assert "global_tag" in rule.tags
     assert "eng_tag" in rule.tags
+
+
+def test_post_process_drops_duplicates_and_tags_the_rest(tmp_path):
+    existing = tmp_path / "existing.yar"
+    existing.write_text('rule old { strings: $s0 = "known" condition: $s0 }')
+
+    def make_rule(name: str, payload: str) -> GeneratedRule:
+        return GeneratedRule(
+            name=name,
+            score=0.5,
+            strings=[RuleString(value=payload, identifier="$s1", score=0.5)],
+            condition="$s1",
+        )
+
+    rules = list(
+        _post_process_rules(
+            [make_rule("dup", "known"), make_rule("new", "fresh")],
+            tags=["global_tag"],
+            metadata={"category": "test_category"},
+            existing_rules_path=existing,
+        )
+    )
+
+    assert [r.name for r in rules] == ["new"]
+    assert rules[0].tags == ["global_tag"]
+    assert rules[0].metadata["category"] == "test_category"
@@ -40,6 +40,15 @@ class TestYaraWriter:
         assert '$s1 = "suspicious string" nocase' in content
         assert 'source = "unit_test"' in content
 
+    def test_write_accepts_lazy_iterable(self, writer, sample_rule, tmp_path):
+        """Rules may come from a generator; the written count is returned."""
+        output_file = tmp_path / "lazy.yar"
+
+        count = writer.write((r for r in [sample_rule]), output_file)
+
+        assert count == 1
+        assert "rule test_rule_01 : test" in output_file.read_text("utf-8")
+
     def test_quote_escaping_in_strings(self, writer, tmp_path):
         """
         CRITICAL: If the prompt contains quotes, they must be escaped.
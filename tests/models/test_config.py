@@ -1,5 +1,8 @@
 from typing import Any
 
+import pytest
+from pydantic import ValidationError
+
 from yara_gen.constants import EngineConstants
 from yara_gen.models.adapter_config import AdapterConfig
 from yara_gen.models.config import (
@@ -24,6 +27,14 @@ def test_ngram_engine_config_overrides() -> None:
     assert config.extra_param == "foo"  # type: ignore
 
 
+def test_ngram_engine_config_rejects_zero_n_jobs() -> None:
+    """n_jobs=0 is not a valid worker count and must fail at load time."""
+    with pytest.raises(ValidationError, match="n_jobs"):
+        NgramEngineConfig(n_jobs=0)
+
+    assert NgramEngineConfig(n_jobs=-1).n_jobs == -1
+
+
 def test_stub_engine_config() -> None:
     """Test StubEngineConfig initialization."""
     config = StubEngineConfig()
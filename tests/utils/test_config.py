@@ -0,0 +1,40 @@
+import pytest
+
+from yara_gen.errors import ConfigurationError
+from yara_gen.utils.config import apply_overrides
+
+
+def test_apply_overrides_sets_nested_typed_values():
+    config = {"engine": {"min_ngram": 3}}
+
+    result = apply_overrides(
+        config, ["engine.min_ngram=4", "engine.enabled=true", "adapter.split=test"]
+    )
+
+    assert result == {
+        "engine": {"min_ngram": 4, "enabled": True},
+        "adapter": {"split": "test"},
+    }
+    # The input config is never mutated
+    assert config == {"engine": {"min_ngram": 3}}
+
+
+def test_apply_overrides_is_repeatable():
+    """Cached parsing must not leak state between calls."""
+    overrides = ["engine.score_threshold=0.5"]
+
+    first = apply_overrides({}, overrides)
+    second = apply_overrides({}, overrides)
+
+    assert first == second == {"engine": {"score_threshold": 0.5}}
+    assert first is not second
+
+
+def test_apply_overrides_rejects_malformed_override():
+    with pytest.raises(ConfigurationError, match="Invalid override format"):
+        apply_overrides({}, ["engine.min_ngram"])
+
+
+def test_apply_overrides_rejects_traversal_into_scalar():
+    with pytest.raises(ConfigurationError, match="'engine' is not a dictionary"):
+        apply_overrides({"engine": 1}, ["engine.min_ngram=4"])
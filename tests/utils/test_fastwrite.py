@@ -0,0 +1,53 @@
+import os
+
+from yara_gen.utils import fastwrite
+from yara_gen.utils.fastwrite import ChunkWriter
+
+
+def test_writes_chunks_in_order(tmp_path):
+    path = tmp_path / "out.jsonl"
+    chunks = [f"line {i}\n".encode() for i in range(2000)]
+
+    with ChunkWriter(path, flush_size=64) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+
+    assert path.read_bytes() == b"".join(chunks)
+
+
+def test_truncates_existing_file(tmp_path):
+    path = tmp_path / "out.jsonl"
+    path.write_bytes(b"stale content that is longer than the new one\n")
+
+    with ChunkWriter(path) as writer:
+        writer.write(b"new\n")
+
+    assert path.read_bytes() == b"new\n"
+
+
+def test_resumes_after_partial_writev(tmp_path, mocker):
+    """Short writes by the OS are continued until every byte is written."""
+    real_writev = os.writev
+
+    def short_writev(fd, buffers):
+        # Write at most 5 bytes per call
+        return real_writev(fd, [b"".join(buffers)[:5]])
+
+    mocker.patch("yara_gen.utils.fastwrite.os.writev", side_effect=short_writev)
+    path = tmp_path / "out.jsonl"
+
+    with ChunkWriter(path) as writer:
+        writer.write(b"abc\n")
+        writer.write(b"defghij\n")
+
+    assert path.read_bytes() == b"abc\ndefghij\n"
+
+
+def test_falls_back_to_buffered_file(tmp_path, mocker):
+    mocker.patch.object(fastwrite, "_HAS_WRITEV", False)
+    path = tmp_path / "out.jsonl"
+
+    with ChunkWriter(path) as writer:
+        writer.write(b"abc\n")
+
+    assert path.read_bytes() == b"abc\n"
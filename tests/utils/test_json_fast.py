@@ -0,0 +1,77 @@
+import importlib
+import json
+import math
+import sys
+
+import pytest
+
+from yara_gen.utils import json_fast
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, mocker):
+    """Runs a test against both the orjson and the standard library backend."""
+    if request.param == "stdlib":
+        mocker.patch.dict(sys.modules, {"orjson": None})
+    else:
+        pytest.importorskip("orjson")
+    yield importlib.reload(json_fast)
+    mocker.stopall()
+    importlib.reload(json_fast)
+
+
+def test_dumps_line_round_trips(backend):
+    data = {"text": "ignore previous", "metadata": {"risk": "high", "n": 1}}
+
+    line = backend.dumps_line(data)
+
+    assert line.endswith(b"\n")
+    assert line.count(b"\n") == 1
+    assert backend.loads(line) == data
+    assert json.loads(line) == data
+
+
+def test_dumps_line_keeps_unicode_unescaped(backend):
+    line = backend.dumps_line({"text": "héllo 世界"})
+
+    assert "héllo 世界".encode() in line
+
+
+def test_loads_raises_stdlib_decode_error(backend):
+    with pytest.raises(json.JSONDecodeError):
+        backend.loads("{not json")
+
+
+def test_dumps_line_stringifies_non_str_keys(backend):
+    assert json.loads(backend.dumps_line({1: "a"})) == {"1": "a"}
+
+
+def test_loads_accepts_nan_and_infinity(backend):
+    data = backend.loads(b'{"text": "a", "score": NaN, "limit": Infinity}')
+
+    assert math.isnan(data["score"])
+    assert data["limit"] == math.inf
+
+
+def test_loads_accepts_lone_surrogate_escape(backend):
+    assert backend.loads(b'{"text": "broken \\ud83d emoji"}') == {
+        "text": "broken \ud83d emoji"
+    }
+
+
+def test_dumps_line_keeps_nan_and_infinity(backend):
+    data = {"metadata": {"score": math.nan, "limits": [math.inf, -math.inf]}}
+
+    line = backend.dumps_line(data)
+
+    assert line == (json.dumps(data, ensure_ascii=False) + "\n").encode()
+    parsed = backend.loads(line)
+    assert math.isnan(parsed["metadata"]["score"])
+    assert parsed["metadata"]["limits"] == [math.inf, -math.inf]
+
+
+def test_dumps_line_keeps_null(backend):
+    assert json.loads(backend.dumps_line({"text": "null", "value": None})) == {
+        "text": "null",
+        "value": None,
+    }
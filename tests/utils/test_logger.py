@@ -1,8 +1,17 @@
 import logging
+import time
 
 import pytest
 
-from yara_gen.utils.logger import get_logger, setup_logger
+from yara_gen.constants import LOGGER_NAME
+from yara_gen.utils import logger as logger_module
+from yara_gen.utils.logger import (
+    _CONFIGURED,
+    get_logger,
+    log_config,
+    log_header,
+    setup_logger,
+)
 
 
 class TestLogger:
@@ -12,8 +21,10 @@ class TestLogger:
         or at least reset handlers."""
         logger = logging.getLogger("test_logger")
         logger.handlers = []
+        _CONFIGURED.discard("test_logger")
         yield
         logger.handlers = []
+        _CONFIGURED.discard("test_logger")
 
     def test_setup_logger_creates_logger(self):
         """Test that setup_logger returns a logger with the correct name."""
@@ -39,3 +50,134 @@ class TestLogger:
         l1 = setup_logger("test_retrieval")
         l2 = get_logger("test_retrieval")
         assert l1 is l2
+
+    def test_log_config_skips_dump_below_info(self, mocker):
+        """log_config should not serialize the config when INFO is disabled."""
+        logger = setup_logger("test_logger", level="WARNING")
+        dumps = mocker.patch("yara_gen.utils.logger.json.dumps")
+
+        log_config(logger, {"engine": {"type": "ngram"}})
+
+        dumps.assert_not_called()
+
+    def test_handlers_follow_logger_level(self):
+        """Handlers inherit the logger level instead of pinning their own."""
+        logger = setup_logger("test_logger", level="WARNING")
+
+        assert logger.level == logging.WARNING
+        assert all(h.level == logging.NOTSET for h in logger.handlers)
+
+    def test_file_logs_are_buffered_until_flush(self, tmp_path):
+        """File records stay buffered; errors and explicit flushes write them."""
+        log_file = tmp_path / "logs" / "run.log"
+        logger = setup_logger("test_logger", log_file=str(log_file))
+        file_handler = logger.handlers[-1]
+
+        logger.info("buffered line")
+        assert "buffered line" not in log_file.read_text(encoding="utf-8")
+
+        file_handler.flush()
+        assert "buffered line" in log_file.read_text(encoding="utf-8")
+
+        logger.info("second line")
+        logger.error("error line")
+        content = log_file.read_text(encoding="utf-8")
+        assert "second line" in content
+        assert "error line" in content
+        file_handler.close()
+
+    def test_file_logs_flush_on_warning(self, tmp_path):
+        """Warnings (and anything buffered before them) are written at once."""
+        log_file = tmp_path / "run.log"
+        logger = setup_logger("test_logger", log_file=str(log_file))
+
+        logger.info("buffered line")
+        logger.warning("warning line")
+
+        content = log_file.read_text(encoding="utf-8")
+        assert "buffered line" in content
+        assert "warning line" in content
+        logger.handlers[-1].close()
+
+    def test_file_logs_are_flushed_periodically(self, tmp_path, monkeypatch):
+        """Buffered records reach the file within the flush interval."""
+        monkeypatch.setattr(logger_module, "FILE_FLUSH_INTERVAL", 0.01)
+        log_file = tmp_path / "run.log"
+        logger = setup_logger("test_logger", log_file=str(log_file))
+
+        logger.info("buffered line")
+
+        deadline = time.monotonic() + 5
+        while "buffered line" not in log_file.read_text(encoding="utf-8"):
+            assert time.monotonic() < deadline, "record was never flushed"
+            time.sleep(0.01)
+        logger.handlers[-1].close()
+
+    def test_unused_file_handler_closes_cleanly(self, tmp_path):
+        """Closing a file handler that never wrote a record does not fail."""
+        logger = setup_logger("test_logger", log_file=str(tmp_path / "run.log"))
+
+        logger.handlers[-1].close()
+
+    def test_log_file_opened_on_first_record(self, tmp_path):
+        """The log file is not created until something is written to it."""
+        log_file = tmp_path / "run.log"
+        logger = setup_logger("test_logger", level="WARNING", log_file=str(log_file))
+
+        logger.info("filtered out")
+        assert not log_file.exists()
+
+        logger.warning("written")
+        assert log_file.exists()
+        logger.handlers[-1].close()
+
+    def test_log_header_centers_title(self, capsys):
+        """The header box is 80 columns wide with the title centered."""
+        log_header(get_logger("test_logger"), title="Run")
+
+        lines = capsys.readouterr().out.splitlines()
+        assert len(lines) == 4
+        assert all(len(line) == 80 for line in lines)
+        assert lines[1] == "| " + "Run".center(76) + " |"
+
+    def test_get_logger_default_name(self):
+        """The default logger is the one logging.getLogger returns."""
+        assert get_logger() is logging.getLogger(LOGGER_NAME)
+
+    def test_log_config_emits_single_record(self, caplog):
+        """The header and JSON body are logged as one record."""
+        logger = setup_logger("test_logger")
+
+        with caplog.at_level(logging.INFO, logger="test_logger"):
+            log_config(logger, {"engine": {"type": "ngram"}})
+
+        assert len(caplog.records) == 1
+        assert caplog.records[0].getMessage().startswith("Configuration:\n{")
+
+    def test_setup_logger_unknown_level_defaults_to_info(self):
+        """Unknown level names (even other logging attributes) fall back to INFO."""
+        logger = setup_logger("test_logger", level="basic_format")
+        assert logger.level == logging.INFO
+
+    def test_setup_logger_ignores_new_log_file_once_configured(self, tmp_path):
+        """A second call with another log file must not add a file handler."""
+        logger = setup_logger("test_logger")
+        num_handlers = len(logger.handlers)
+
+        setup_logger("test_logger", log_file=str(tmp_path / "other.log"))
+
+        assert len(logger.handlers) == num_handlers
+        assert not (tmp_path / "other.log").exists()
+
+    def test_setup_logger_can_retry_after_failure(self, tmp_path, mocker):
+        """A setup that fails part-way attaches nothing and can be retried."""
+        mocker.patch("yara_gen.utils.logger.os.makedirs", side_effect=PermissionError)
+        with pytest.raises(PermissionError):
+            setup_logger("test_logger", log_file=str(tmp_path / "logs" / "run.log"))
+
+        assert logging.getLogger("test_logger").handlers == []
+        mocker.stopall()
+
+        logger = setup_logger("test_logger", log_file=str(tmp_path / "run.log"))
+        assert len(logger.handlers) == 2
+        logger.handlers[-1].close()